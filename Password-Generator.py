@@ -11,9 +11,62 @@ import random
 import string
 import json
 import os
+import sys
 import argparse
 import time
-from typing import List, Dict, Any
+import math
+import heapq
+import operator
+import hashlib
+import tempfile
+import mmap
+import struct
+import unicodedata
+import copy
+import re
+import datetime
+import contextlib
+import tracemalloc
+import cProfile
+import pstats
+import atexit
+import collections
+import io
+import multiprocessing
+import concurrent.futures
+import http.server
+import urllib.parse
+import threading
+import weakref
+import asyncio
+import logging
+import queue
+import subprocess
+import gzip
+import bz2
+import lzma
+from array import array
+from collections import Counter
+from typing import List, Dict, Any, Iterable, Iterator, Tuple, Callable, AsyncIterator, Union
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+__version__ = '1.0.0'
+
+logger = logging.getLogger('password_generator')
 
 class Banner:
     @staticmethod
@@ -134,49 +187,1218 @@ class Banner:
 """
         print(warning)
 
-class PasswordListGenerator:
+class Deduplicator:
+    """Base class for streaming deduplication engines"""
+    name = 'base'
+    # Whether filter() yields first occurrences in input order as it reads
+    ordered = True
+    
     def __init__(self):
-        self.common_special_chars = '!@#$%^&*'
+        self.unique = 0
+        self.duplicates = 0
+    
+    @staticmethod
+    def fingerprint(word: str) -> int:
+        """64-bit non-zero fingerprint of a word"""
+        digest = hashlib.blake2b(word.encode('utf-8'), digest_size=8).digest()
+        return int.from_bytes(digest, 'little') or 1
+    
+    def add(self, word: str) -> bool:
+        """Record a word, returning True if it has not been seen before"""
+        raise NotImplementedError
+    
+    def filter(self, candidates: Iterable[str]) -> Iterator[str]:
+        """Yield only the first occurrence of each candidate"""
+        for word in candidates:
+            if self.add(word):
+                self.unique += 1
+                yield word
+            else:
+                self.duplicates += 1
+    
+    def filter_batch(self, batch: 'WordBatch') -> 'WordBatch':
+        """Drop duplicates from a WordBatch"""
+        return WordBatch.from_words(self.filter(batch))
+    
+    def memory_bytes(self) -> int:
+        """Approximate memory held by the engine"""
+        return 0
+    
+    def report(self) -> str:
+        """One-line summary of the engine's work"""
+        return (f"🧮 Dedup ({self.name}): {self.unique} unique, {self.duplicates} duplicates, "
+                f"{self.memory_bytes() / 1048576:.2f} MB used")
+    
+    @staticmethod
+    def create(mode: str = 'exact', capacity: int = 1000000, fp_rate: float = 0.001,
+               chunk_size: int = 1000000, temp_dir: str = None) -> 'Deduplicator':
+        """Build a deduplication engine by mode name"""
+        if not 0 < fp_rate < 1:
+            raise ValueError(f"fp_rate must be between 0 and 1 (exclusive), got {fp_rate}")
+        if mode == 'exact':
+            return ExactDeduplicator(capacity)
+        if mode == 'bloom':
+            return BloomDeduplicator(capacity, fp_rate)
+        if mode == 'external':
+            return ExternalSortDeduplicator(chunk_size, temp_dir)
+        raise ValueError(f"Unknown dedup mode: {mode}")
+
+class ExactDeduplicator(Deduplicator):
+    """Dedup over a set of 64-bit fingerprints in an open-addressing array table.
+    
+    Words are compared by fingerprint only, so two distinct words that collide
+    (about n**2 / 2**65 expected pairs for n words) count as duplicates.
+    capacity is only a sizing hint: the table starts small, is pre-sized up
+    to MAX_INITIAL_SLOTS at most, and doubles as it fills.
+    """
+    name = 'exact'
+    INITIAL_SLOTS = 1024
+    MAX_INITIAL_SLOTS = 1 << 20
+    
+    def __init__(self, capacity: int = 1024):
+        super().__init__()
+        size = self.INITIAL_SLOTS
+        while size < self.MAX_INITIAL_SLOTS and size * 7 < capacity * 10:
+            size *= 2
+        self._table = array('Q', [0]) * size
+        self._mask = size - 1
+        self._used = 0
+    
+    def add(self, word: str) -> bool:
+        fp = self.fingerprint(word)
+        table = self._table
+        mask = self._mask
+        i = fp & mask
+        while True:
+            slot = table[i]
+            if slot == 0:
+                break
+            if slot == fp:
+                return False
+            i = (i + 1) & mask
+        table[i] = fp
+        self._used += 1
+        if self._used * 10 > len(table) * 7:
+            self._grow()
+        return True
+    
+    def _grow(self):
+        old = self._table
+        self._table = array('Q', [0]) * (2 * len(old))
+        self._mask = len(self._table) - 1
+        table, mask = self._table, self._mask
+        for fp in old:
+            if fp:
+                i = fp & mask
+                while table[i]:
+                    i = (i + 1) & mask
+                table[i] = fp
+    
+    def memory_bytes(self) -> int:
+        return self._table.itemsize * len(self._table)
+
+class BloomDeduplicator(Deduplicator):
+    """Probabilistic dedup; may drop a unique word with probability fp_rate"""
+    name = 'bloom'
+    
+    def __init__(self, capacity: int = 1000000, fp_rate: float = 0.001):
+        super().__init__()
+        if not 0 < fp_rate < 1:
+            raise ValueError(f"Bloom fp_rate must be between 0 and 1 (exclusive), got {fp_rate}")
+        capacity = max(capacity, 1)
+        self._bits_count = max(64, int(math.ceil(-capacity * math.log(fp_rate) / (math.log(2) ** 2))))
+        self._hashes = max(1, round(self._bits_count / capacity * math.log(2)))
+        self._bits = bytearray((self._bits_count + 7) // 8)
+    
+    def add(self, word: str) -> bool:
+        digest = hashlib.blake2b(word.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        bits, m = self._bits, self._bits_count
+        new = False
+        for i in range(self._hashes):
+            pos = (h1 + i * h2) % m
+            mask = 1 << (pos & 7)
+            if not bits[pos >> 3] & mask:
+                bits[pos >> 3] |= mask
+                new = True
+        return new
+    
+    def memory_bytes(self) -> int:
+        return len(self._bits)
+
+class ExternalSortDeduplicator(Deduplicator):
+    """Exact dedup that spills sorted runs to disk.
+    
+    filter() reads the whole input before yielding anything and yields the
+    distinct words sorted, not in input order, so a consumer that stops after
+    N words still pays for the full stream and gets the first N in sort order.
+    add() answers word by word from an in-memory fingerprint table instead.
+    """
+    name = 'external'
+    ordered = False
+    
+    def __init__(self, chunk_size: int = 1000000, temp_dir: str = None):
+        super().__init__()
+        self.chunk_size = chunk_size
+        self.temp_dir = temp_dir
+        self.spilled_bytes = 0
+        self._peak_bytes = 0
+        self._seen = None
+    
+    def add(self, word: str) -> bool:
+        if self._seen is None:
+            self._seen = ExactDeduplicator()
+        return self._seen.add(word)
+    
+    def _spill(self, chunk: set, runs: List[str]):
+        fd, path = tempfile.mkstemp(prefix='pwgen-run-', suffix='.txt', dir=self.temp_dir)
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            for word in sorted(chunk):
+                f.write(f"{word}\n")
+        self.spilled_bytes += os.path.getsize(path)
+        runs.append(path)
+    
+    @staticmethod
+    def _read_run(path: str) -> Iterator[str]:
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                yield line[:-1]
+    
+    def filter(self, candidates: Iterable[str]) -> Iterator[str]:
+        runs = []
+        chunk = set()
+        chunk_bytes = 0
+        try:
+            for word in candidates:
+                if word not in chunk:
+                    chunk.add(word)
+                    chunk_bytes += sys.getsizeof(word)
+                else:
+                    self.duplicates += 1
+                if len(chunk) >= self.chunk_size:
+                    self._peak_bytes = max(self._peak_bytes, chunk_bytes + sys.getsizeof(chunk))
+                    self._spill(chunk, runs)
+                    chunk = set()
+                    chunk_bytes = 0
+            self._peak_bytes = max(self._peak_bytes, chunk_bytes + sys.getsizeof(chunk))
+            
+            streams = [self._read_run(path) for path in runs] + [iter(sorted(chunk))]
+            chunk = None
+            previous = None
+            for word in heapq.merge(*streams):
+                if word == previous:
+                    self.duplicates += 1
+                    continue
+                previous = word
+                self.unique += 1
+                yield word
+        finally:
+            for path in runs:
+                os.remove(path)
+    
+    def memory_bytes(self) -> int:
+        return self._peak_bytes + (self._seen.memory_bytes() if self._seen is not None else 0)
+    
+    def report(self) -> str:
+        return super().report() + f", {self.spilled_bytes / 1048576:.2f} MB spilled"
+
+class LeetEngine:
+    """Position-by-position leet substitution over precompiled per-word tables"""
+    DEFAULT_MAPPING = {
+        'a': ['4', '@'],
+        'e': ['3'],
+        'i': ['1', '!'],
+        'o': ['0'],
+        's': ['5', '$'],
+        't': ['7']
+    }
+    
+    def __init__(self, mapping: Dict[str, List[str]] = None, cache_size: int = 10000):
+        mapping = self.DEFAULT_MAPPING if mapping is None else mapping
+        self.mapping = {char.lower(): list(replacements) for char, replacements in mapping.items()}
+        self.cache_size = cache_size
+        self._tables = {}
+    
+    def compile(self, word: str) -> Tuple[Tuple[str, ...], ...]:
+        """Build (and cache) the substitution table: original char first, then replacements"""
+        table = self._tables.get(word)
+        if table is None:
+            table = tuple(
+                (char,) + tuple(dict.fromkeys(
+                    r for r in self.mapping.get(char.lower(), ()) if r != char
+                ))
+                for char in word
+            )
+            if len(self._tables) >= self.cache_size:
+                self._tables.clear()
+            self._tables[word] = table
+        return table
+    
+    @staticmethod
+    def _iter_with_substitutions(word: str, table: Tuple[Tuple[str, ...], ...],
+                                 positions: List[int], k: int) -> Iterator[str]:
+        """Yield every variant of word with exactly k substituted positions"""
+        for combo in itertools.combinations(positions, k):
+            for replacements in itertools.product(*(table[i][1:] for i in combo)):
+                chars = list(word)
+                for i, replacement in zip(combo, replacements):
+                    chars[i] = replacement
+                yield ''.join(chars)
+    
+    def iter_variants(self, word: str, limit: int = None, order: str = 'fewest',
+                      case_forms: bool = True) -> Iterator[str]:
+        """Lazily enumerate leet variants of word.
         
-    def generate_leet_speak(self, word: str, custom_mapping: Dict = None) -> List[str]:
-        """Generate leet speak variations of a word"""
-        if custom_mapping is None:
-            custom_mapping = {
-                'a': ['4', '@'],
-                'e': ['3'],
-                'i': ['1', '!'],
-                'o': ['0'],
-                's': ['5', '$'],
-                't': ['7']
-            }
+        order='fewest' ranks by number of substitutions (the word itself first);
+        order='product' walks the substitution table in plain product order.
+        With case_forms the lowercase and capitalized forms are enumerated too.
+        """
+        bases = list(dict.fromkeys([word, word.lower(), word.capitalize()] if case_forms else [word]))
+        tables = [self.compile(base) for base in bases]
         
-        variations = [word]
+        if order == 'product':
+            variants = (''.join(chars) for table in tables for chars in itertools.product(*table))
+        elif order == 'fewest':
+            positions = [[i for i, options in enumerate(table) if len(options) > 1] for table in tables]
+            variants = (
+                variant
+                for k in range(max(len(p) for p in positions) + 1)
+                for base, table, base_positions in zip(bases, tables, positions)
+                for variant in self._iter_with_substitutions(base, table, base_positions, k)
+            )
+        else:
+            raise ValueError(f"Unknown leet order: {order}")
         
-        for char, replacements in custom_mapping.items():
-            new_variations = []
-            for variation in variations:
-                if char in variation.lower():
-                    for replacement in replacements:
-                        new_variations.append(variation.lower().replace(char, replacement))
-                        new_variations.append(variation.capitalize().replace(char, replacement))
-            variations.extend(new_variations)
+        if case_forms:
+            # Case forms can coincide after substitution (e.g. '4dmin' from 'admin' and 'Admin')
+            variants = self._unique(variants)
+        return itertools.islice(variants, limit)
+    
+    @staticmethod
+    def _unique(variants: Iterator[str]) -> Iterator[str]:
+        seen = set()
+        for variant in variants:
+            if variant not in seen:
+                seen.add(variant)
+                yield variant
+
+class KeyboardWalker:
+    """Keyboard walks enumerated by DFS over a key adjacency graph.
+    
+    Layouts list their rows top to bottom as (base, shifted) strings, aligned
+    so a key's upper neighbours sit at the same and next column and its lower
+    neighbours at the previous and same column. A walk steps between adjacent
+    keys without revisiting any, and each change of direction is a turn.
+    """
+    LAYOUTS = {
+        'qwerty': (
+            ('1234567890-=', '!@#$%^&*()_+'),
+            ('qwertyuiop[]\\', 'QWERTYUIOP{}|'),
+            ("asdfghjkl;'", 'ASDFGHJKL:"'),
+            ('zxcvbnm,./', 'ZXCVBNM<>?')
+        ),
+        'qwertz': (
+            ('1234567890ß´', '!"§$%&/()=?`'),
+            ('qwertzuiopü+', 'QWERTZUIOPÜ*'),
+            ('asdfghjklöä#', "ASDFGHJKLÖÄ'"),
+            ('yxcvbnm,.-', 'YXCVBNM;:_')
+        ),
+        'azerty': (
+            ('&é"\'(-è_çà)=', '1234567890°+'),
+            ('azertyuiop^$', 'AZERTYUIOP¨£'),
+            ('qsdfghjklmù*', 'QSDFGHJKLM%µ'),
+            ('wxcvbn,;:!', 'WXCVBN?./§')
+        )
+    }
+    # (row, column) step of each direction: E, W, NW, NE, SW, SE
+    DIRECTIONS = ((0, 1), (0, -1), (-1, 0), (-1, 1), (1, -1), (1, 0))
+    CACHE_ENTRIES = 64
+    CACHE_MAX_WALKS = 1000000
+    # Shared by every walker so repeated requests for the same walks are free
+    _cache = collections.OrderedDict()
+    
+    def __init__(self, layout: str = 'qwerty'):
+        if layout not in self.LAYOUTS:
+            raise ValueError(f"Unknown keyboard layout: {layout}")
+        self.layout = layout
+        rows = self.LAYOUTS[layout]
+        positions = [(r, c) for r, (base, _) in enumerate(rows) for c in range(len(base))]
+        index = {position: i for i, position in enumerate(positions)}
+        self.base = [rows[r][0][c] for r, c in positions]
+        self.shifted = [rows[r][1][c] for r, c in positions]
+        self.keys = {char: i for layer in (self.shifted, self.base) for i, char in enumerate(layer)}
+        # neighbours[key] lists (direction, key); runs[key][direction] counts straight steps left
+        self.neighbours = [[(d, index[(r + dr, c + dc)]) for d, (dr, dc) in enumerate(self.DIRECTIONS)
+                            if (r + dr, c + dc) in index] for r, c in positions]
+        self.runs = []
+        for r, c in positions:
+            runs = []
+            for dr, dc in self.DIRECTIONS:
+                steps = 0
+                while (r + (steps + 1) * dr, c + (steps + 1) * dc) in index:
+                    steps += 1
+                runs.append(steps)
+            self.runs.append(runs)
+    
+    def _iter_paths(self, min_length: int, max_length: int, turns: int,
+                    starts: List[int]) -> Iterator[Tuple[int, ...]]:
+        """Yield key paths with exactly the given number of turns"""
+        for start in starts:
+            stack = [(start, (start,), -1, 0)]
+            while stack:
+                key, path, direction, changes = stack.pop()
+                length = len(path)
+                if length >= min_length and changes == turns:
+                    yield path
+                if length == max_length:
+                    continue
+                for d, following in reversed(self.neighbours[key]):
+                    if following in path:
+                        continue
+                    following_changes = changes + (direction >= 0 and d != direction)
+                    if following_changes > turns:
+                        continue
+                    # Every turn still owed needs a step, and without turns left only a straight run remains
+                    if turns - following_changes > max_length - length - 1:
+                        continue
+                    if following_changes == turns and length + 1 + self.runs[following][d] < min_length:
+                        continue
+                    stack.append((following, path + (following,), d, following_changes))
+    
+    def iter_walks(self, min_length: int = 4, max_length: int = None, max_turns: int = 1,
+                   starts: str = None, shifted: bool = True) -> Iterator[str]:
+        """Lazily yield walks of min_length..max_length keys, fewest turns first.
         
-        return list(dict.fromkeys(variations))
+        starts restricts the first key (base or shifted characters); with
+        shifted each walk is followed by the same keys on the shift layer.
+        Fully enumerated results are cached per layout and parameters.
+        """
+        max_length = max_length or min_length
+        key = (self.layout, min_length, max_length, max_turns, starts, shifted)
+        cached = self._cache.get(key)
+        if cached is not None:
+            self._cache.move_to_end(key)
+            yield from cached
+            return
+        
+        start_keys = list(range(len(self.base))) if starts is None else \
+            list(dict.fromkeys(self.keys[char] for char in starts if char in self.keys))
+        layers = (self.base, self.shifted) if shifted else (self.base,)
+        walks = []
+        for turns in range(max_turns + 1):
+            for path in self._iter_paths(min_length, max_length, turns, start_keys):
+                for layer in layers:
+                    walk = ''.join([layer[i] for i in path])
+                    if walks is not None:
+                        walks.append(walk)
+                        if len(walks) > self.CACHE_MAX_WALKS:
+                            walks = None
+                    yield walk
+        
+        if walks is not None:
+            self._cache[key] = walks
+            if len(self._cache) > self.CACHE_ENTRIES:
+                self._cache.popitem(last=False)
+
+class RandomStream:
+    """Counter-based random candidates drawn in bulk.
+    
+    Block n of stream s is shake_256(seed key, kind, s, n), so every block can
+    be computed independently: streams never overlap and any run is reproduced
+    from its seed alone. Blocks are mapped onto the charset with a single
+    bytes.translate, deleting the bytes that would bias the modulo.
+    """
+    DEFAULT_CHARSET = string.ascii_letters + string.digits + '!@#$%'
+    BLOCK_SIZE = 65536
+    
+    def __init__(self, seed: int, stream: int = 0, charset: str = None,
+                 min_length: int = 8, max_length: int = 12):
+        charset = ''.join(dict.fromkeys(charset or self.DEFAULT_CHARSET))
+        if not charset.isascii() or not 0 < len(charset) <= 128:
+            raise ValueError("Random charset must be 1-128 distinct ASCII characters")
+        if not 0 < min_length <= max_length or max_length - min_length >= 256:
+            raise ValueError("Random lengths must satisfy 0 < min <= max < min + 256")
+        self.seed = seed
+        self.stream = stream
+        self.charset = charset
+        self.min_length = min_length
+        self.max_length = max_length
+        self._key = hashlib.sha256(str(seed).encode('utf-8')).digest()
+        self._chars = self._table(charset.encode('ascii'))
+        self._lengths = self._table(bytes(range(min_length, max_length + 1)))
+    
+    @staticmethod
+    def _table(symbols: bytes) -> Tuple[bytes, bytes]:
+        """Translate table and rejected bytes for unbiased byte -> symbol mapping"""
+        limit = 256 - 256 % len(symbols)
+        table = bytes(symbols[b % len(symbols)] if b < limit else 0 for b in range(256))
+        return table, bytes(range(limit, 256))
     
-    def generate_keyboard_patterns(self, length: int = 8) -> List[str]:
-        """Generate keyboard walk patterns"""
-        patterns = []
+    def _block(self, kind: bytes, counter: int) -> bytes:
+        return hashlib.shake_256(self._key + kind + struct.pack('<QQ', self.stream, counter)).digest(self.BLOCK_SIZE)
+    
+    def _iter_symbols(self, kind: bytes, table: Tuple[bytes, bytes]) -> Iterator[bytes]:
+        for counter in itertools.count():
+            yield self._block(kind, counter).translate(*table)
+    
+    def iter_candidates(self) -> Iterator[str]:
+        """Yield an endless, reproducible sequence of random candidates"""
+        chars = self._iter_symbols(b'C', self._chars)
+        text = ''
+        position = 0
+        for lengths in self._iter_symbols(b'L', self._lengths):
+            for length in lengths:
+                end = position + length
+                if end > len(text):
+                    text = text[position:] + next(chars).decode('ascii')
+                    position, end = 0, length
+                yield text[position:end]
+                position = end
+    
+    def take(self, count: int) -> List[str]:
+        return list(itertools.islice(self.iter_candidates(), count))
+    
+    @classmethod
+    def generate(cls, seed: int, count: int, workers: int = 1, chunk_size: int = 65536,
+                 policy: 'PasswordPolicy' = None, stats: 'RunStats' = None, **options) -> Iterator[str]:
+        """Yield count candidates built from fixed-size chunks, chunk j from stream j.
         
-        keyboard_rows = [
-            'qwertyuiop',
-            'asdfghjkl',
-            'zxcvbnm'
-        ]
+        Output depends only on the seed, options and chunk_size, never on the
+        number of workers, which compute chunks in parallel and are merged in
+        order. stats, when given, counts candidates before the policy drops any.
+        """
+        tasks = ((cls, seed, chunk, chunk_size, options) for chunk in itertools.count())
+        if workers > 1:
+            with multiprocessing.Pool(workers) as pool:
+                # A bounded window of chunks in flight keeps imap from draining the endless task stream
+                candidates = (password for window in iter(lambda: list(itertools.islice(tasks, workers * 2)), [])
+                              for batch in pool.imap(_random_chunk, window)
+                              for password in batch.split('\n'))
+                if stats is not None:
+                    candidates = stats.counted('generated', candidates)
+                if policy is not None:
+                    candidates = policy.filter(candidates, 'random')
+                yield from itertools.islice(candidates, count)
+        else:
+            candidates = (password for cls, seed, chunk, chunk_size, options in tasks
+                          for password in cls(seed, stream=chunk, **options).take(chunk_size))
+            if stats is not None:
+                candidates = stats.counted('generated', candidates)
+            if policy is not None:
+                candidates = policy.filter(candidates, 'random')
+            yield from itertools.islice(candidates, count)
+
+def _toggle_at(word: str, n: int) -> str:
+    if n >= len(word):
+        return word
+    return word[:n] + word[n].swapcase() + word[n + 1:]
+
+def _insert_at(word: str, args: Tuple[int, str]) -> str:
+    n, char = args
+    if n > len(word):
+        return word
+    return word[:n] + char + word[n:]
+
+def _overwrite_at(word: str, args: Tuple[int, str]) -> str:
+    n, char = args
+    if n >= len(word):
+        return word
+    return word[:n] + char + word[n + 1:]
+
+class RuleEngine:
+    """Hashcat/John-style mangling rules compiled once into opcode programs.
+    
+    Each rule line compiles to a tuple of (function, argument) pairs, with
+    runs of appends/prepends folded into a single operation. A function that
+    returns None rejects the word.
+    """
+    # op char -> (argument spec, implementation); N = position, X/Y = characters
+    OPS = {
+        ':': ('', lambda w, a: w),
+        'l': ('', lambda w, a: w.lower()),
+        'u': ('', lambda w, a: w.upper()),
+        'c': ('', lambda w, a: w.capitalize()),
+        'C': ('', lambda w, a: w[:1].lower() + w[1:].upper()),
+        't': ('', lambda w, a: w.swapcase()),
+        'T': ('N', _toggle_at),
+        'r': ('', lambda w, a: w[::-1]),
+        'd': ('', lambda w, a: w + w),
+        'p': ('N', lambda w, a: w * (a + 1)),
+        'f': ('', lambda w, a: w + w[::-1]),
+        '{': ('', lambda w, a: w[1:] + w[:1]),
+        '}': ('', lambda w, a: w[-1:] + w[:-1]),
+        '$': ('X', lambda w, a: w + a),
+        '^': ('X', lambda w, a: a + w),
+        '[': ('', lambda w, a: w[1:]),
+        ']': ('', lambda w, a: w[:-1]),
+        'D': ('N', lambda w, a: w[:a] + w[a + 1:]),
+        "'": ('N', lambda w, a: w[:a]),
+        'x': ('NN', lambda w, a: w[a[0]:a[0] + a[1]]),
+        'i': ('NX', _insert_at),
+        'o': ('NX', _overwrite_at),
+        's': ('XY', lambda w, a: w.replace(a[0], a[1])),
+        '@': ('X', lambda w, a: w.replace(a, '')),
+        'z': ('N', lambda w, a: w[:1] * a + w),
+        'Z': ('N', lambda w, a: w + w[-1:] * a),
+        'q': ('', lambda w, a: ''.join(c + c for c in w)),
+        # hashcat semantics: <N rejects words longer than N, >N rejects words shorter than N
+        '<': ('N', lambda w, a: w if len(w) <= a else None),
+        '>': ('N', lambda w, a: w if len(w) >= a else None),
+        '!': ('X', lambda w, a: None if a in w else w),
+        '/': ('X', lambda w, a: w if a in w else None),
+    }
+    POSITIONS = '0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ'
+    
+    def __init__(self, rules: Iterable[str] = ()):
+        self.programs = []
+        self.rejected_rules = 0
+        self.words = 0
+        self.candidates = 0
+        self.elapsed = 0.0
+        for rule in rules:
+            self.add_rule(rule)
+    
+    @classmethod
+    def load(cls, filename: str) -> 'RuleEngine':
+        """Compile every rule in a rule file"""
+        with open(filename, 'r', encoding='utf-8') as f:
+            return cls(line.rstrip('\r\n') for line in f)
+    
+    def add_rule(self, rule: str):
+        """Compile and register one rule line; comments and blank lines are ignored"""
+        if not rule.strip() or rule.startswith('#'):
+            return
+        try:
+            self.programs.append(self.compile_rule(rule))
+        except ValueError as e:
+            self.rejected_rules += 1
+            print(f"⚠️  Skipping rule {rule!r}: {e}")
+    
+    @classmethod
+    def compile_rule(cls, rule: str) -> Tuple[Tuple[Any, Any], ...]:
+        """Parse one rule line into an opcode program"""
+        program = []
+        i = 0
+        while i < len(rule):
+            op = rule[i]
+            i += 1
+            if op == ' ':
+                continue
+            if op not in cls.OPS:
+                raise ValueError(f"unknown operation {op!r}")
+            spec, func = cls.OPS[op]
+            if i + len(spec) > len(rule):
+                raise ValueError(f"missing argument for {op!r}")
+            args = []
+            for kind in spec:
+                char = rule[i]
+                i += 1
+                if kind == 'N':
+                    if char not in cls.POSITIONS:
+                        raise ValueError(f"invalid position {char!r} for {op!r}")
+                    args.append(cls.POSITIONS.index(char))
+                else:
+                    args.append(char)
+            arg = args[0] if len(args) == 1 else tuple(args) or None
+            
+            # Fold runs of appends/prepends into one string operation
+            if program and op in '$^' and program[-1][0] == op:
+                previous = program[-1][2]
+                program[-1] = (op, func, previous + arg if op == '$' else arg + previous)
+            elif op != ':':
+                program.append((op, func, arg))
+        return tuple((func, arg) for _, func, arg in program)
+    
+    def apply(self, words: Iterable[str], batch_size: int = 10000) -> Iterator[List[str]]:
+        """Apply all rules to the words in streaming batches of base words"""
+        programs = self.programs
+        words = iter(words)
+        while True:
+            batch = list(itertools.islice(words, batch_size))
+            if not batch:
+                return
+            start = time.perf_counter()
+            output = []
+            append = output.append
+            for word in batch:
+                for program in programs:
+                    result = word
+                    for func, arg in program:
+                        result = func(result, arg)
+                        if result is None:
+                            break
+                    else:
+                        append(result)
+            self.elapsed += time.perf_counter() - start
+            self.words += len(batch)
+            self.candidates += len(batch) * len(programs)
+            yield output
+    
+    def throughput(self) -> float:
+        """Words x rules applied per second so far"""
+        return self.candidates / self.elapsed if self.elapsed else 0.0
+    
+    def report(self) -> str:
+        return (f"⚙️  Applied {len(self.programs)} rules to {self.words} words "
+                f"({self.throughput():,.0f} words×rules/s)")
+
+class MaskGenerator:
+    """Enumerate a hashcat-style mask keyspace in order with index-to-candidate arithmetic"""
+    CHARSETS = {
+        'l': string.ascii_lowercase,
+        'u': string.ascii_uppercase,
+        'd': string.digits,
+        'h': '0123456789abcdef',
+        'H': '0123456789ABCDEF',
+        's': ' ' + string.punctuation,
+        'a': string.ascii_lowercase + string.ascii_uppercase + string.digits + ' ' + string.punctuation
+    }
+    # Trailing positions expanded into a precomputed suffix table
+    SUFFIX_TABLE_LIMIT = 65536
+    
+    def __init__(self, mask: str, custom_charsets: Dict[str, str] = None):
+        self.mask = mask
+        charsets = dict(self.CHARSETS)
+        for key, value in (custom_charsets or {}).items():
+            charsets[key] = self._expand(value, self.CHARSETS)
+        self.positions = self._parse(mask, charsets)
+        self.keyspace = 1
+        for charset in self.positions:
+            self.keyspace *= len(charset)
+    
+    @staticmethod
+    def _expand(spec: str, charsets: Dict[str, str]) -> str:
+        """Expand ?x references inside a custom charset definition"""
+        chars = []
+        i = 0
+        while i < len(spec):
+            if spec[i] == '?' and i + 1 < len(spec):
+                key = spec[i + 1]
+                if key != '?' and key not in charsets:
+                    raise ValueError(f"Unknown charset ?{key} in custom charset {spec!r}")
+                chars.append('?' if key == '?' else charsets[key])
+                i += 2
+            else:
+                chars.append(spec[i])
+                i += 1
+        return ''.join(dict.fromkeys(''.join(chars)))
+    
+    @staticmethod
+    def _parse(mask: str, charsets: Dict[str, str]) -> List[str]:
+        positions = []
+        i = 0
+        while i < len(mask):
+            if mask[i] == '?':
+                if i + 1 >= len(mask):
+                    raise ValueError("Mask ends with a lone '?'")
+                key = mask[i + 1]
+                if key == '?':
+                    positions.append('?')
+                elif key in charsets:
+                    positions.append(charsets[key])
+                else:
+                    raise ValueError(f"Unknown charset ?{key} in mask")
+                i += 2
+            else:
+                positions.append(mask[i])
+                i += 1
+        return positions
+    
+    def candidate_at(self, index: int) -> str:
+        """Return the candidate at a keyspace position in O(length)"""
+        if not 0 <= index < self.keyspace:
+            raise IndexError(f"Index {index} outside keyspace of {self.keyspace}")
+        return self._decode(self.positions, index)
+    
+    @staticmethod
+    def _decode(positions: List[str], index: int) -> str:
+        chars = []
+        for charset in reversed(positions):
+            index, digit = divmod(index, len(charset))
+            chars.append(charset[digit])
+        return ''.join(reversed(chars))
+    
+    def iter_candidates(self, skip: int = 0, limit: int = None,
+                        policy: 'PasswordPolicy' = None) -> Iterator[str]:
+        """Yield candidates [skip, skip + limit) in keyspace order.
+        
+        skip and limit always address raw keyspace positions, so work splits the
+        same way with or without a policy. With a policy, the whole mask, then
+        each prefix block, then each suffix group is pruned by length and by
+        the character classes it can still reach.
+        """
+        # Validated here rather than on first next(), before any output is opened
+        if skip < 0:
+            raise ValueError(f"skip must not be negative, got {skip}")
+        if limit is not None and limit < 0:
+            raise ValueError(f"limit must not be negative, got {limit}")
+        end = self.keyspace if limit is None else min(self.keyspace, skip + limit)
+        if skip >= end:
+            return iter(())
+        if policy is not None:
+            return self._iter_with_policy(skip, end, policy)
+        return self._iter_range(skip, end)
+    
+    def _iter_range(self, skip: int, end: int) -> Iterator[str]:
+        # Split into a prefix decoded per block and a suffix table walked at C speed
+        prefix_positions, suffixes, block = self._split()
+        
+        first_block, offset = divmod(skip, block)
+        last_block, last_offset = divmod(end, block)
+        for block_index in range(first_block, last_block + 1):
+            if block_index == last_block and last_offset == 0:
+                break
+            prefix = self._decode(prefix_positions, block_index)
+            start = offset if block_index == first_block else 0
+            stop = last_offset if block_index == last_block else block
+            for suffix in itertools.islice(suffixes, start, stop):
+                yield prefix + suffix
+    
+    def _split(self) -> Tuple[List[str], List[str], int]:
+        """Prefix positions, precomputed suffix table and block size"""
+        split = len(self.positions)
+        block = 1
+        while split > 0 and block * len(self.positions[split - 1]) <= self.SUFFIX_TABLE_LIMIT:
+            split -= 1
+            block *= len(self.positions[split])
+        suffixes = [''.join(chars) for chars in itertools.product(*self.positions[split:])]
+        return self.positions[:split], suffixes, block
+    
+    def _iter_with_policy(self, skip: int, end: int, policy: 'PasswordPolicy') -> Iterator[str]:
+        length = len(self.positions)
+        all_classes = 0
+        for charset in self.positions:
+            all_classes |= PasswordUtils.char_classes(charset)
+        if not policy.can_complete(length, length, all_classes):
+            policy.pruned['mask'] += end - skip
+            return
+        
+        prefix_positions, suffixes, block = self._split()
+        suffix_classes = [PasswordUtils.char_classes(suffix) for suffix in suffixes]
+        reachable_suffix = 0
+        for classes in set(suffix_classes):
+            reachable_suffix |= classes
+        check_each = policy.allow is not None or policy.deny is not None
+        pruned = 0
+        try:
+            first_block, offset = divmod(skip, block)
+            last_block, last_offset = divmod(end, block)
+            for block_index in range(first_block, last_block + 1):
+                if block_index == last_block and last_offset == 0:
+                    break
+                start = offset if block_index == first_block else 0
+                stop = last_offset if block_index == last_block else block
+                prefix = self._decode(prefix_positions, block_index)
+                needed = policy.required & ~PasswordUtils.char_classes(prefix)
+                if needed & reachable_suffix != needed:
+                    pruned += stop - start
+                    continue
+                for i in range(start, stop):
+                    if suffix_classes[i] & needed != needed:
+                        pruned += 1
+                        continue
+                    candidate = prefix + suffixes[i]
+                    if check_each and not policy.check(candidate):
+                        pruned += 1
+                        continue
+                    yield candidate
+        finally:
+            policy.pruned['mask'] += pruned
+
+class SegmentCache:
+    """Content-addressed on-disk cache of generated level segments.
+    
+    A segment file is a header, the UTF-8 words back to back, then a uint64
+    offset index, so it can be written while streaming and later memory-mapped
+    and sliced without parsing. Files are evicted least-recently-used once
+    the directory exceeds max_bytes.
+    """
+    MAGIC = b'PWSG'
+    VERSION = 1
+    HEADER = struct.Struct('<4sHBQQ')
+    
+    def __init__(self, directory: str = None, max_bytes: int = 1024 * 1048576):
+        self.directory = directory or os.path.join(os.path.expanduser('~'), '.cache', 'password-generator')
+        self.max_bytes = max_bytes
+        os.makedirs(self.directory, exist_ok=True)
+        self.evict()
+    
+    @staticmethod
+    def key(**parts) -> str:
+        """Digest identifying a segment by everything that determines its content"""
+        parts['cache_version'] = SegmentCache.VERSION
+        parts['generator_version'] = __version__
+        return hashlib.sha256(json.dumps(parts, sort_keys=True).encode('utf-8')).hexdigest()
+    
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.seg")
+    
+    def get(self, key: str, count: int) -> Iterator[str]:
+        """Iterator over the first count words of a stored segment, or None on a miss"""
+        path = self._path(key)
+        try:
+            f = open(path, 'rb')
+        except FileNotFoundError:
+            return None
+        with f:
+            header = f.read(self.HEADER.size)
+            if len(header) < self.HEADER.size:
+                return None
+            magic, version, complete, stored, index_offset = self.HEADER.unpack(header)
+            if magic != self.MAGIC or version != self.VERSION or (stored < count and not complete):
+                return None
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        os.utime(path)
+        return self._iter_segment(buffer, min(count, stored), index_offset)
+    
+    def _iter_segment(self, buffer: mmap.mmap, count: int, index_offset: int) -> Iterator[str]:
+        offsets = memoryview(buffer)[index_offset:index_offset + 8 * (count + 1)].cast('Q')
+        base = self.HEADER.size
+        try:
+            for i in range(count):
+                yield buffer[base + offsets[i]:base + offsets[i + 1]].decode('utf-8')
+        finally:
+            offsets.release()
+            buffer.close()
+    
+    def store(self, key: str, words: Iterable[str], count: int) -> Iterator[str]:
+        """Pass up to count words through while writing them as a segment"""
+        fd, temp_path = tempfile.mkstemp(prefix='segment-', suffix='.tmp', dir=self.directory)
+        offsets = array('Q', [0])
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(b'\0' * self.HEADER.size)
+                position = 0
+                for word in itertools.islice(words, count):
+                    data = word.encode('utf-8')
+                    f.write(data)
+                    position += len(data)
+                    offsets.append(position)
+                    yield word
+                # Never pull past count (that would cost the caller extra RNG draws), so only
+                # a level that ran dry early is known to be exhausted and fully cached
+                complete = len(offsets) - 1 < count
+                index_offset = self.HEADER.size + position
+                f.write(offsets.tobytes())
+                f.seek(0)
+                f.write(self.HEADER.pack(self.MAGIC, self.VERSION, complete, len(offsets) - 1, index_offset))
+            os.replace(temp_path, self._path(key))
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+        self.evict()
+    
+    def evict(self):
+        """Remove least recently used segments until the cache fits in max_bytes"""
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.endswith('.seg'):
+                path = os.path.join(self.directory, name)
+                stat = os.stat(path)
+                entries.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            os.remove(path)
+            total -= size
+
+class Combinator:
+    """Lazy N-way cross product of component lists (words, names, separators, years, suffixes).
+    
+    Candidates come out in stable product order. A policy is pushed down into
+    the walk: a branch is dropped as soon as no completion of its prefix can
+    satisfy the length window or the required character classes.
+    """
+    
+    def __init__(self, components: List[List[str]], cap: int = None, policy: 'PasswordPolicy' = None):
+        self.components = [list(dict.fromkeys(component))[:cap] for component in components]
+        self.policy = policy
+        self.min_length = policy.min_length if policy else 0
+        self.max_length = policy.max_length if policy else None
+        # Shortest/longest completion, reachable classes and combination count from each component on
+        size = len(self.components)
+        self._rest_min = [0] * (size + 1)
+        self._rest_max = [0] * (size + 1)
+        self._rest_classes = [0] * (size + 1)
+        self._rest_count = [1] * (size + 1)
+        self._part_classes = [[PasswordUtils.char_classes(part) for part in component]
+                              for component in self.components]
+        for i in range(size - 1, -1, -1):
+            lengths = [len(part) for part in self.components[i]] or [0]
+            self._rest_min[i] = self._rest_min[i + 1] + min(lengths)
+            self._rest_max[i] = self._rest_max[i + 1] + max(lengths)
+            self._rest_classes[i] = self._rest_classes[i + 1]
+            for classes in self._part_classes[i]:
+                self._rest_classes[i] |= classes
+            self._rest_count[i] = self._rest_count[i + 1] * len(self.components[i])
+    
+    @staticmethod
+    def parse_component(spec: str, keywords: List[str], names: List[str]) -> List[str]:
+        """Build one component from a spec.
+        
+        words | names | file:PATH | years:1990-2024 |
+        dates:2024-01-01..2024-12-31[:%d%m%Y] | list:a,b,c (an empty item is allowed)
+        """
+        kind, _, value = spec.partition(':')
+        if kind == 'words':
+            return list(keywords)
+        if kind == 'names':
+            return list(names)
+        if kind == 'file':
+            return list(PasswordUtils.iter_wordlist(value))
+        if kind == 'years':
+            start, _, end = value.partition('-')
+            return [str(year) for year in range(int(start), int(end or start) + 1)]
+        if kind == 'dates':
+            span, _, fmt = value.partition(':')
+            start, _, end = span.partition('..')
+            day = datetime.date.fromisoformat(start)
+            last = datetime.date.fromisoformat(end or start)
+            dates = []
+            while day <= last:
+                dates.append(day.strftime(fmt or '%d%m%Y'))
+                day += datetime.timedelta(days=1)
+            return dates
+        if kind in ('list', 'sep', 'suffix'):
+            return value.split(',')
+        raise ValueError(f"Unknown combinator component: {spec}")
+    
+    @property
+    def size_is_exact(self) -> bool:
+        """False when allow/deny regexes make total_size() only an upper bound"""
+        return self.policy is None or (self.policy.allow is None and self.policy.deny is None)
+    
+    def total_size(self) -> int:
+        """Number of combinations inside the length window that have the required classes.
+        
+        Allow/deny regexes cannot be counted without enumerating, so with either
+        of them active this is an upper bound (see size_is_exact).
+        """
+        required = self.policy.required if self.policy else 0
+        if self.min_length <= 0 and self.max_length is None and not required:
+            return math.prod(len(component) for component in self.components)
+        # Convolve per-component (length, required classes seen) distributions
+        distribution = Counter({(0, 0): 1})
+        for component, part_classes in zip(self.components, self._part_classes):
+            parts = Counter((len(part), classes & required) for part, classes in zip(component, part_classes))
+            combined = Counter()
+            for (total, seen), ways in distribution.items():
+                for (length, classes), count in parts.items():
+                    if self.max_length is None or total + length <= self.max_length:
+                        combined[total + length, seen | classes] += ways * count
+            distribution = combined
+        return sum(ways for (length, seen), ways in distribution.items()
+                   if length >= self.min_length and seen == required)
+    
+    def iter_candidates(self) -> Iterator[str]:
+        """Yield combinations lazily, never building branches the policy rules out"""
+        if not self.components:
+            return
+        policy = self.policy
+        if policy is None:
+            yield from map(''.join, itertools.product(*self.components))
+            return
+        
+        last = len(self.components) - 1
+        pruned = 0
+        
+        def walk(index: int, prefix: str, classes: int) -> Iterator[str]:
+            nonlocal pruned
+            rest_min = self._rest_min[index + 1]
+            rest_max = self._rest_max[index + 1]
+            rest_classes = self._rest_classes[index + 1]
+            for part, part_classes in zip(self.components[index], self._part_classes[index]):
+                length = len(prefix) + len(part)
+                reachable = classes | part_classes
+                if not policy.can_complete(length + rest_min, length + rest_max, reachable | rest_classes):
+                    pruned += self._rest_count[index + 1]
+                    continue
+                if index < last:
+                    yield from walk(index + 1, prefix + part, reachable)
+                elif policy.check(prefix + part):
+                    yield prefix + part
+                else:
+                    pruned += 1
+        
+        try:
+            yield from walk(0, '', 0)
+        finally:
+            policy.pruned['combinator'] += pruned
+
+class GenerationState:
+    """Resumable position of a comprehensive run: stage index, position within it, RNG state at its start"""
+    
+    def __init__(self, stage: int = 0, position: int = 0, rng_state: tuple = None, emitted: int = 0):
+        self.stage = stage
+        self.position = position
+        self.rng_state = rng_state
+        self.emitted = emitted
+    
+    def to_dict(self) -> Dict[str, Any]:
+        version, internal, gauss = self.rng_state
+        return {
+            'stage': self.stage,
+            'position': self.position,
+            'rng_state': [version, list(internal), gauss]
+        }
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'GenerationState':
+        version, internal, gauss = data['rng_state']
+        return cls(data['stage'], data['position'], (version, tuple(internal), gauss))
+
+class MarkovModel:
+    """Per-position first-order Markov chain over characters.
+    
+    Log-probabilities live in one float32 table indexed [position][previous][next],
+    where the extra symbol index stands for start (as previous) and end (as next).
+    Saved models are memory-mapped on load, so nothing is parsed at startup.
+    """
+    MAGIC = b'PWMK'
+    VERSION = 1
+    HEADER = struct.Struct('<4sHHI')
+    
+    def __init__(self, alphabet: str, max_length: int, table, buffer=None):
+        self.alphabet = alphabet
+        self.max_length = max_length
+        self.table = table
+        self._buffer = buffer
+        self._symbols = len(alphabet) + 1
+        self._children = {}
+    
+    @classmethod
+    def train(cls, corpus: Iterable[str], max_length: int = 16) -> 'MarkovModel':
+        """Count transitions in a corpus and convert them to log-probabilities"""
+        counts = Counter()
+        for word in corpus:
+            if 0 < len(word) <= max_length:
+                counts[word] += 1
+        alphabet = ''.join(sorted({char for word in counts for char in word}))
+        index = {char: i for i, char in enumerate(alphabet)}
+        boundary = len(alphabet)
+        symbols = boundary + 1
+        
+        transitions = Counter()
+        for word, count in counts.items():
+            previous = boundary
+            for position, char in enumerate(word):
+                transitions[(position, previous, index[char])] += count
+                previous = index[char]
+            transitions[(len(word), previous, boundary)] += count
+        
+        totals = Counter()
+        for (position, previous, _), count in transitions.items():
+            totals[(position, previous)] += count
+        
+        table = array('f', [-math.inf]) * ((max_length + 1) * symbols * symbols)
+        for (position, previous, following), count in transitions.items():
+            table[(position * symbols + previous) * symbols + following] = \
+                math.log(count / totals[(position, previous)])
+        return cls(alphabet, max_length, table)
+    
+    def save(self, filename: str):
+        """Write the model as header + alphabet + aligned float32 table"""
+        alphabet = self.alphabet.encode('utf-8')
+        header = self.HEADER.pack(self.MAGIC, self.VERSION, self.max_length, len(alphabet))
+        padding = -(len(header) + len(alphabet)) % 4
+        with open(filename, 'wb') as f:
+            f.write(header + alphabet + b'\0' * padding)
+            f.write(array('f', self.table).tobytes())
+    
+    @classmethod
+    def load(cls, filename: str) -> 'MarkovModel':
+        """Memory-map a saved model"""
+        with open(filename, 'rb') as f:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, max_length, alphabet_size = cls.HEADER.unpack_from(buffer)
+        if magic != cls.MAGIC or version != cls.VERSION:
+            raise ValueError(f"{filename} is not a version {cls.VERSION} Markov model")
+        start = cls.HEADER.size
+        alphabet = buffer[start:start + alphabet_size].decode('utf-8')
+        start += alphabet_size + (-(start + alphabet_size) % 4)
+        table = memoryview(buffer)[start:].cast('f')
+        return cls(alphabet, max_length, table, buffer)
+    
+    def children(self, position: int, previous: int) -> List[Tuple[float, int]]:
+        """Possible next symbols after previous at position, most likely first"""
+        key = (position, previous)
+        result = self._children.get(key)
+        if result is None:
+            symbols = self._symbols
+            base = (position * symbols + previous) * symbols
+            result = sorted(
+                ((self.table[base + following], following) for following in range(symbols)
+                 if self.table[base + following] != -math.inf),
+                reverse=True
+            )
+            self._children[key] = result
+        return result
+    
+    def iter_candidates(self, min_length: int = 1, max_length: int = None) -> Iterator[str]:
+        """Yield candidates in descending probability with a best-first priority queue.
         
-        for row in keyboard_rows:
-            for i in range(len(row) - length + 1):
-                patterns.append(row[i:i+length])
-                patterns.append(row[i:i+length][::-1])
+        Each queue entry is "child number rank of a prefix". Popping it pushes
+        only its next sibling and its own best child, both no more likely than
+        itself, so the queue stays small and candidates come out exactly ordered.
+        """
+        max_length = self.max_length if max_length is None else min(max_length, self.max_length)
+        boundary = len(self.alphabet)
+        tiebreak = itertools.count()
+        queue = []
+        
+        def push(prefix, previous, rank, prefix_score):
+            position = len(prefix)
+            options = self.children(position, previous)
+            if rank < len(options):
+                score, following = options[rank]
+                heapq.heappush(queue, (-(prefix_score + score), next(tiebreak),
+                                       prefix, previous, rank, prefix_score))
+        
+        push('', boundary, 0, 0.0)
+        while queue:
+            negative_score, _, prefix, previous, rank, prefix_score = heapq.heappop(queue)
+            push(prefix, previous, rank + 1, prefix_score)
+            following = self.children(len(prefix), previous)[rank][1]
+            if following == boundary:
+                if len(prefix) >= min_length:
+                    yield prefix
+            elif len(prefix) < max_length:
+                push(prefix + self.alphabet[following], following, 0, -negative_score)
+
+class PasswordListGenerator:
+    # Share of the total count given to each level in comprehensive mode
+    LEVEL_SHARES = [
+        ('beginner', 0.2),
+        ('intermediate', 0.3),
+        ('advanced', 0.3),
+        ('names', 0.2)
+    ]
+    
+    def __init__(self, seed: int = None, progress: Callable[[str], None] = None):
+        # Progress lines go to stdout unless an embedding application supplies its own hook
+        self.progress = progress if progress is not None else print
+        self.common_special_chars = '!@#$%^&*'
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.leet = LeetEngine()
+        self.max_leet_variants = 64
+        self.keyboard = KeyboardWalker()
+        self.max_walk_turns = 1
+        self.cache = None
+        
+    def generate_leet_speak(self, word: str, custom_mapping: Dict = None,
+                            max_variants: int = None) -> List[str]:
+        """Generate leet speak variations of a word, fewest substitutions first"""
+        engine = self.leet if custom_mapping is None else LeetEngine(custom_mapping)
+        if max_variants is None:
+            max_variants = self.max_leet_variants
+        return list(engine.iter_variants(word, limit=max_variants))
+    
+    def generate_keyboard_patterns(self, length: int = 8, max_length: int = None) -> List[str]:
+        """Generate keyboard walk patterns, straight walks first"""
+        patterns = list(self.keyboard.iter_walks(length, max_length, self.max_walk_turns))
         
         common_patterns = [
             '1qaz2wsx', '1q2w3e4r', '1q2w3e4r5t',
@@ -186,10 +1408,9 @@ class PasswordListGenerator:
         
         return patterns
     
-    def generate_beginner_passwords(self, count=100) -> List[str]:
-        """Generate beginner level passwords"""
-        print("🔰 Generating beginner passwords...")
-        passwords = []
+    def iter_beginner_passwords(self, progress: Callable[[str], None] = None) -> Iterator[str]:
+        """Lazily yield beginner level passwords; progress overrides the generator's hook"""
+        (progress or self.progress)("🔰 Generating beginner passwords...")
         
         common = [
             '123456', 'password', '12345678', 'qwerty', '123456789',
@@ -199,116 +1420,301 @@ class PasswordListGenerator:
             'mustang', '1234567890', 'michael', '654321', 'superman',
             '1qaz2wsx', '7777777', '121212', '000000'
         ]
-        passwords.extend(common)
+        yield from common
         
         for i in range(100, 1000):
-            passwords.append(f"pass{i}")
-            passwords.append(f"test{i}")
-            passwords.append(f"admin{i}")
-        
-        keyboard_patterns = self.generate_keyboard_patterns()
-        passwords.extend(keyboard_patterns)
+            yield f"pass{i}"
+            yield f"test{i}"
+            yield f"admin{i}"
         
-        return passwords[:count]
+        yield from self.generate_keyboard_patterns()
     
-    def generate_intermediate_passwords(self, keywords: List[str] = None, count=200) -> List[str]:
-        """Generate intermediate level passwords"""
-        print("🔸 Generating intermediate passwords...")
+    def generate_beginner_passwords(self, count=100, as_batch: bool = False) -> Union[List[str], 'WordBatch']:
+        """Generate beginner level passwords"""
+        return self._collect(itertools.islice(self.iter_beginner_passwords(), count), as_batch)
+    
+    def iter_intermediate_passwords(self, keywords: Iterable[str] = None,
+                                    progress: Callable[[str], None] = None) -> Iterator[str]:
+        """Lazily yield intermediate level passwords"""
+        (progress or self.progress)("🔸 Generating intermediate passwords...")
         if keywords is None:
             keywords = ['user', 'admin', 'test']
         
-        passwords = []
         special_chars = ['!', '@', '#', '$', '%']
         
         for keyword in keywords:
             for i in range(100, 1000):
-                passwords.append(f"{keyword}{i}")
-                passwords.append(f"{keyword}{i}!")
+                yield f"{keyword}{i}"
+                yield f"{keyword}{i}!"
             
             for char in special_chars:
-                passwords.append(f"{keyword}{char}123")
-                passwords.append(f"{keyword}123{char}")
+                yield f"{keyword}{char}123"
+                yield f"{keyword}123{char}"
         
         common_words = ['hello', 'welcome', 'sunshine', 'dragon', 'shadow']
         for word in common_words:
             for i in range(100, 500):
-                passwords.append(f"{word}{i}")
-        
-        return passwords[:count]
+                yield f"{word}{i}"
     
-    def generate_advanced_passwords(self, keywords: List[str] = None, count=300) -> List[str]:
-        """Generate advanced level passwords"""
-        print("🔷 Generating advanced passwords...")
+    def generate_intermediate_passwords(self, keywords: List[str] = None, count=200,
+                                        as_batch: bool = False) -> Union[List[str], 'WordBatch']:
+        """Generate intermediate level passwords"""
+        return self._collect(itertools.islice(self.iter_intermediate_passwords(keywords), count), as_batch)
+    
+    def iter_advanced_passwords(self, keywords: Iterable[str] = None,
+                                progress: Callable[[str], None] = None) -> Iterator[str]:
+        """Lazily yield advanced level passwords"""
+        (progress or self.progress)("🔷 Generating advanced passwords...")
         if keywords is None:
             keywords = ['admin', 'user', 'secure']
         
-        passwords = []
-        
         for keyword in keywords:
-            leet_variations = self.generate_leet_speak(keyword)
-            passwords.extend(leet_variations)
+            yield from self.leet.iter_variants(keyword, limit=self.max_leet_variants)
             
-            for variation in leet_variations[:5]:
+            for variation in self.leet.iter_variants(keyword, limit=5):
                 for year in [2020, 2021, 2022, 2023, 2024]:
-                    passwords.append(f"{variation}{year}")
-                    passwords.append(f"{variation}_{year}")
-                    passwords.append(f"{variation}@{year}")
-        
-        for _ in range(50):
-            length = random.randint(8, 12)
-            password = ''.join(random.choices(string.ascii_letters + string.digits + '!@#$%', k=length))
-            passwords.append(password)
+                    yield f"{variation}{year}"
+                    yield f"{variation}_{year}"
+                    yield f"{variation}@{year}"
         
-        return passwords[:count]
+        yield from RandomStream(self.rng.getrandbits(64)).take(50)
     
-    def generate_name_based_passwords(self, names: List[str], count=200) -> List[str]:
-        """Generate passwords based on names"""
-        print("👤 Generating name-based passwords...")
-        passwords = []
+    def generate_advanced_passwords(self, keywords: List[str] = None, count=300,
+                                    as_batch: bool = False) -> Union[List[str], 'WordBatch']:
+        """Generate advanced level passwords"""
+        return self._collect(itertools.islice(self.iter_advanced_passwords(keywords), count), as_batch)
+    
+    def iter_name_based_passwords(self, names: Iterable[str],
+                                  progress: Callable[[str], None] = None) -> Iterator[str]:
+        """Lazily yield passwords based on names"""
+        (progress or self.progress)("👤 Generating name-based passwords...")
         
         for name in names:
-            passwords.extend([
+            yield from [
                 name.lower(),
                 name.capitalize(),
                 name.lower() + '123',
                 name.capitalize() + '123',
                 name.lower() + '2024',
                 name.capitalize() + '2024'
-            ])
+            ]
             
-            leet_name = self.generate_leet_speak(name.lower())
-            passwords.extend(leet_name)
+            yield from self.leet.iter_variants(name.lower(), limit=self.max_leet_variants)
             
             for char in ['!', '@', '#', '$']:
-                passwords.append(f"{name.lower()}{char}123")
-                passwords.append(f"{name.capitalize()}{char}123")
-                passwords.append(f"{name.lower()}{char}2024")
+                yield f"{name.lower()}{char}123"
+                yield f"{name.capitalize()}{char}123"
+                yield f"{name.lower()}{char}2024"
+    
+    def generate_name_based_passwords(self, names: List[str], count=200,
+                                      as_batch: bool = False) -> Union[List[str], 'WordBatch']:
+        """Generate passwords based on names"""
+        return self._collect(itertools.islice(self.iter_name_based_passwords(names), count), as_batch)
+    
+    @staticmethod
+    def _collect(candidates: Iterable[str], as_batch: bool) -> Union[List[str], 'WordBatch']:
+        """Materialize candidates as a list, or packed into a WordBatch"""
+        return WordBatch.from_words(candidates) if as_batch else list(candidates)
+    
+    def iter_level_batches(self, level: str, keywords: Iterable[str] = None, names: Iterable[str] = None,
+                           batch_size: int = 65536) -> Iterator['WordBatch']:
+        """Lazily yield a level as WordBatches of up to batch_size candidates"""
+        candidates = self.iter_level(level, keywords, names)
+        for chunk in iter(lambda: list(itertools.islice(candidates, batch_size)), []):
+            yield WordBatch.from_words(chunk, batch_size)
+    
+    def iter_level(self, level: str, keywords: Iterable[str] = None, names: Iterable[str] = None,
+                   progress: Callable[[str], None] = None) -> Iterator[str]:
+        """Lazily yield one level by name ('beginner', 'intermediate', 'advanced' or 'names')"""
+        if level == 'beginner':
+            return self.iter_beginner_passwords(progress)
+        if level == 'intermediate':
+            return self.iter_intermediate_passwords(keywords, progress)
+        if level == 'advanced':
+            return self.iter_advanced_passwords(keywords, progress)
+        if level == 'names':
+            return self.iter_name_based_passwords(names or [], progress)
+        raise ValueError(f"Unknown level: {level}")
+    
+    def iter_level_cached(self, level: str, keywords: List[str] = None, names: List[str] = None,
+                          limit: int = 1000, progress: Callable[[str], None] = None) -> Iterator[str]:
+        """Yield up to limit candidates of a level, served from the segment cache when possible"""
+        # Random candidates are only reproducible, and so only cacheable, with a seed
+        if self.cache is None or (level == 'advanced' and self.seed is None):
+            return itertools.islice(self.iter_level(level, keywords, names, progress), limit)
         
-        return passwords[:count]
+        key = self.cache.key(
+            level=level,
+            keywords=PasswordUtils.digest_words(keywords) if level in ('intermediate', 'advanced') else None,
+            names=PasswordUtils.digest_words(names) if names and level == 'names' else None,
+            mapping=self.leet.mapping,
+            max_leet_variants=self.max_leet_variants,
+            keyboard=[self.keyboard.layout, self.max_walk_turns] if level == 'beginner' else None,
+            seed=self.seed if level == 'advanced' else None
+        )
+        cached = self.cache.get(key, limit)
+        if cached is not None:
+            (progress or self.progress)(f"📦 Using cached {level} segment")
+            return cached
+        return self.cache.store(key, self.iter_level(level, keywords, names, progress), limit)
+    
+    def iter_comprehensive_list(self, keywords: List[str] = None, names: List[str] = None,
+                                total_count=1000, dedup: 'Deduplicator' = None,
+                                state: 'GenerationState' = None,
+                                policy: 'PasswordPolicy' = None,
+                                progress: Callable[[str], None] = None,
+                                stats: 'RunStats' = None) -> Iterator[str]:
+        """Lazily yield a deduplicated comprehensive list, stopping once total_count is reached.
+        
+        Each level is capped at its share of total_count before deduplication,
+        so the output matches generate_comprehensive_list exactly. When a
+        GenerationState is passed, it is kept up to date with the current stage
+        and position, and a restored state resumes from where it left off.
+        The template levels are small, so a policy is checked per candidate
+        rather than pushed down; the share then counts passing candidates.
+        progress, when given, replaces the generator's hook for this run only,
+        and stats counts the candidates each level generates.
+        """
+        if dedup is None:
+            dedup = Deduplicator.create('exact', capacity=total_count)
+        if state is None:
+            state = GenerationState()
+        if state.rng_state is None:
+            state.rng_state = self.rng.getstate()
+        else:
+            self.rng.setstate(state.rng_state)
+        
+        stages = [(level, share) for level, share in self.LEVEL_SHARES
+                  if level != 'names' or names]
+        
+        def candidates():
+            for index in range(state.stage, len(stages)):
+                level, share = stages[index]
+                if index != state.stage:
+                    # Reset the position before advancing the stage so an interruption never skips input
+                    state.position = 0
+                    state.rng_state = self.rng.getstate()
+                    state.stage = index
+                quota = int(total_count * share)
+                if policy is None:
+                    stage_candidates = self.iter_level_cached(level, keywords, names, quota, progress)
+                    check = None
+                else:
+                    # The quota counts candidates that pass, so the level is read past its raw share
+                    stage_candidates = self.iter_level(level, keywords, names, progress)
+                    check = policy.check
+                # Replaying the skipped prefix recovers how much of the quota it used
+                skipped = itertools.islice(stage_candidates, state.position)
+                passed = state.position if check is None else sum(1 for password in skipped if check(password))
+                if check is None:
+                    collections.deque(skipped, maxlen=0)
+                if stats is not None:
+                    # The replayed prefix was counted by the run that first generated it
+                    stage_candidates = stats.counted('generated', stage_candidates)
+                pruned = 0
+                try:
+                    # Never pull past the quota, which would cost the level extra RNG draws
+                    while passed < quota:
+                        password = next(stage_candidates, None)
+                        if password is None:
+                            break
+                        if check is not None and not check(password):
+                            pruned += 1
+                            state.position += 1
+                            continue
+                        yield password
+                        passed += 1
+                        # Counted only once the consumer has taken it, so the position never runs ahead
+                        state.position += 1
+                    if check is None:
+                        # The stream is capped at the quota, so this only lets a cache segment finish
+                        next(stage_candidates, None)
+                finally:
+                    if policy is not None:
+                        policy.pruned[level] += pruned
+                    if stats is not None:
+                        stage_candidates.close()
+        
+        yield from itertools.islice(dedup.filter(candidates()), max(0, total_count - state.emitted))
     
     def generate_comprehensive_list(self, keywords: List[str] = None, names: List[str] = None, 
-                                  total_count=1000) -> List[str]:
+                                  total_count=1000, dedup: 'Deduplicator' = None,
+                                  as_batch: bool = False) -> Union[List[str], 'WordBatch']:
         """Generate comprehensive password list from beginner to advanced"""
-        all_passwords = []
-        
-        beginner = self.generate_beginner_passwords(int(total_count * 0.2))
-        all_passwords.extend(beginner)
+        return self._collect(self.iter_comprehensive_list(keywords, names, total_count, dedup), as_batch)
+
+    async def stream(self, level: str = 'all', keywords: List[str] = None, names: List[str] = None,
+                     total_count: int = 1000, batch_size: int = 1000, max_pending: int = 4,
+                     dedup: 'Deduplicator' = None, policy: 'PasswordPolicy' = None,
+                     executor: concurrent.futures.Executor = None,
+                     progress: Callable[[str], None] = None) -> AsyncIterator[List[str]]:
+        """Asynchronously yield batches of up to batch_size candidates.
         
-        intermediate = self.generate_intermediate_passwords(keywords, int(total_count * 0.3))
-        all_passwords.extend(intermediate)
+        Generation runs in an executor thread so the event loop stays free. At
+        most max_pending batches are buffered; a slow consumer blocks the
+        producer instead of growing memory. Breaking out of the loop or
+        cancelling the consuming task stops the producer at the next batch.
+        Progress lines go to progress, or to the 'password_generator' logger.
+        """
+        loop = asyncio.get_running_loop()
+        batches = asyncio.Queue(max_pending)
+        stopped = threading.Event()
         
-        advanced = self.generate_advanced_passwords(keywords, int(total_count * 0.3))
-        all_passwords.extend(advanced)
+        def put(batch):
+            asyncio.run_coroutine_threadsafe(batches.put(batch), loop).result()
         
-        if names:
-            name_based = self.generate_name_based_passwords(names, int(total_count * 0.2))
-            all_passwords.extend(name_based)
+        def produce():
+            try:
+                if level == 'all':
+                    candidates = self.iter_comprehensive_list(keywords, names, total_count, dedup,
+                                                              policy=policy, progress=progress or logger.info)
+                else:
+                    candidates = self.iter_level(level, keywords, names, progress or logger.info)
+                    if policy is not None:
+                        candidates = policy.filter(candidates, level)
+                    if dedup is not None:
+                        candidates = dedup.filter(candidates)
+                    candidates = itertools.islice(candidates, total_count)
+                while not stopped.is_set():
+                    batch = list(itertools.islice(candidates, batch_size))
+                    if not batch:
+                        break
+                    put(batch)
+            finally:
+                put(None)
         
-        return list(dict.fromkeys(all_passwords))[:total_count]
+        producer = loop.run_in_executor(executor, produce)
+        try:
+            while True:
+                batch = await batches.get()
+                if batch is None:
+                    break
+                yield batch
+        finally:
+            stopped.set()
+            # Keep draining so a producer blocked on a full queue can see the stop flag
+            while not producer.done():
+                while not batches.empty():
+                    batches.get_nowait()
+                await asyncio.wait({producer}, timeout=0.05)
+            producer.result()
 
-    def generate_custom_pattern(self, base_words: List[str], patterns: List[str]) -> List[str]:
+    def iter_rule_based(self, base_words: Iterable[str], rules: 'RuleEngine',
+                        batch_size: int = 10000) -> Iterator[str]:
+        """Lazily yield base words mangled by a compiled rule set"""
+        self.progress(f"⚙️  Applying {len(rules.programs)} rules...")
+        for batch in rules.apply(base_words, batch_size):
+            yield from batch
+    
+    def generate_rule_based(self, base_words: List[str], rules: 'RuleEngine',
+                            count: int = None) -> List[str]:
+        """Generate passwords by applying mangling rules to base words"""
+        return list(itertools.islice(self.iter_rule_based(base_words, rules), count))
+    
+    def generate_custom_pattern(self, base_words: List[str], patterns: List[str],
+                                dedup: 'Deduplicator' = None) -> List[str]:
         """Generate passwords based on custom patterns"""
-        print("🎨 Generating custom pattern passwords...")
+        self.progress("🎨 Generating custom pattern passwords...")
         passwords = []
         
         for word in base_words:
@@ -319,97 +1725,1965 @@ class PasswordListGenerator:
                     passwords.append(word + pattern)
                     passwords.append(pattern + word)
         
-        return list(dict.fromkeys(passwords))
+        if dedup is None:
+            dedup = Deduplicator.create('exact', capacity=len(passwords))
+        return list(dedup.filter(passwords))
 
 class PasswordUtils:
     @staticmethod
-    def save_wordlist(passwords: List[str], filename: str, format_type: str = 'txt'):
-        """Save password list to file"""
-        
-        if format_type == 'txt':
-            with open(filename, 'w', encoding='utf-8') as f:
-                for password in passwords:
-                    f.write(f"{password}\n")
-        
-        elif format_type == 'json':
-            data = {
-                'metadata': {
-                    'total_passwords': len(passwords),
-                    'generated_at': time.strftime('%Y-%m-%d %H:%M:%S'),
-                    'wordlist_name': os.path.splitext(filename)[0]
-                },
-                'passwords': passwords
-            }
-            with open(filename, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2)
+    def save_wordlist(passwords: Iterable[str], filename: str, format_type: str = 'txt',
+                      background: bool = False, atomic: bool = False) -> int:
+        """Save password list to file, consuming iterators incrementally"""
+        with WordlistWriter(filename, format_type, background=background, atomic=atomic) as writer:
+            if isinstance(passwords, WordBatch):
+                writer.write_batch(passwords)
+            else:
+                writer.write_many(passwords)
         
-        print(f"💾 Wordlist saved to {filename} with {len(passwords)} passwords")
+        print(f"💾 Wordlist saved to {filename} with {writer.count} passwords")
+        print(writer.report())
+        return writer.count
+
+    @staticmethod
+    def compression_for(filename: str) -> str:
+        """Compression implied by a filename extension ('' for plain files)"""
+        ext = os.path.splitext(filename)[1].lower()
+        return ext if ext in ('.gz', '.bz2', '.xz', '.zst') else ''
+
+    @staticmethod
+    def open_binary(filename: str, mode: str = 'rb', compression: str = None):
+        """Open a plain or compressed file in binary mode, chosen by extension"""
+        if compression is None:
+            compression = PasswordUtils.compression_for(filename)
+        if compression == '.gz':
+            return gzip.open(filename, mode, compresslevel=6) if 'w' in mode else gzip.open(filename, mode)
+        if compression == '.bz2':
+            return bz2.open(filename, mode)
+        if compression == '.xz':
+            return lzma.open(filename, mode)
+        if compression == '.zst':
+            if zstandard is None:
+                raise RuntimeError("zstd files require the 'zstandard' package (pip install zstandard)")
+            if 'w' in mode:
+                return zstandard.ZstdCompressor().stream_writer(open(filename, mode))
+            return io.BufferedReader(zstandard.ZstdDecompressor().stream_reader(open(filename, mode)))
+        return open(filename, mode)
+
+    @staticmethod
+    def iter_wordlist(filename: str, format_type: str = 'txt') -> Iterator[str]:
+        """Lazily read back a wordlist written by save_wordlist"""
+        with io.TextIOWrapper(PasswordUtils.open_binary(filename), encoding='utf-8', newline='\n') as f:
+            if format_type == 'json':
+                yield from json.load(f)['passwords']
+            elif format_type == 'jsonl':
+                for line in f:
+                    yield json.loads(line)
+            else:
+                for line in f:
+                    yield line.rstrip('\n')
+
+    @staticmethod
+    def iter_lines(filename: str) -> Iterator[str]:
+        """Stream raw lines of a plain (memory-mapped) or compressed file; undecodable lines yield None"""
+        if PasswordUtils.compression_for(filename):
+            stream = PasswordUtils.open_binary(filename)
+            lines = iter(stream)
+        else:
+            stream = open(filename, 'rb')
+            if os.fstat(stream.fileno()).st_size == 0:
+                stream.close()
+                return
+            buffer = mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_READ)
+            stream.close()
+            stream = buffer
+            lines = iter(buffer.readline, b'')
+        with stream:
+            for line in lines:
+                try:
+                    yield line.decode('utf-8')
+                except UnicodeDecodeError:
+                    yield None
+
+    @staticmethod
+    def normalize_word(word: str, lowercase: bool = False) -> str:
+        """NFKC-normalize, collapse whitespace and optionally casefold"""
+        word = ' '.join(unicodedata.normalize('NFKC', word).split())
+        return word.casefold() if lowercase else word
+
+    @staticmethod
+    def digest_words(words: Iterable[str]) -> str:
+        """Streaming digest of a word sequence, for cache and checkpoint keys"""
+        if words is None:
+            return None
+        if isinstance(words, WordSource):
+            return words.digest()
+        digest = hashlib.sha256()
+        for word in words:
+            digest.update(word.encode('utf-8') + b'\n')
+        return digest.hexdigest()
 
     @staticmethod
     def load_keywords(filename: str) -> List[str]:
-        """Load keywords from file"""
-        if os.path.exists(filename):
-            with open(filename, 'r', encoding='utf-8') as f:
-                return [line.strip() for line in f if line.strip()]
-        return []
+        """Load normalized, deduplicated keywords from a plain or compressed file"""
+        return list(WordSource([filename]))
 
     @staticmethod
     def load_names(filename: str) -> List[str]:
         """Load names from file"""
         return PasswordUtils.load_keywords(filename)
 
+    # Character-class bits used by the entropy estimate
+    LOWER, UPPER, DIGIT, SPECIAL = 1, 2, 4, 8
+    SPECIAL_CHARS = '!@#$%^&*'
+    CLASS_SIZES = {LOWER: 26, UPPER: 26, DIGIT: 10, SPECIAL: 8}
+
+    @staticmethod
+    def char_classes(password: str) -> int:
+        """Bitmask of the character classes present in a password"""
+        mask = 0
+        for c in set(password):
+            if c.islower():
+                mask |= PasswordUtils.LOWER
+            elif c.isupper():
+                mask |= PasswordUtils.UPPER
+            elif c.isdigit():
+                mask |= PasswordUtils.DIGIT
+            elif c in PasswordUtils.SPECIAL_CHARS:
+                mask |= PasswordUtils.SPECIAL
+        return mask
+
+    @staticmethod
+    def charset_size(mask: int) -> int:
+        """Size of the character set implied by a class bitmask"""
+        return sum(size for bit, size in PasswordUtils.CLASS_SIZES.items() if mask & bit)
+
+    @staticmethod
+    def entropy_for(length: int, mask: int) -> float:
+        """Entropy estimate from a length and a class bitmask"""
+        char_set = PasswordUtils.charset_size(mask)
+        if char_set == 0:
+            return 0
+        return round(length * (char_set ** 0.5), 2)
+
     @staticmethod
     def calculate_entropy(password: str) -> float:
         """Calculate password entropy"""
-        char_set = 0
-        if any(c.islower() for c in password):
-            char_set += 26
-        if any(c.isupper() for c in password):
-            char_set += 26
-        if any(c.isdigit() for c in password):
-            char_set += 10
-        if any(c in '!@#$%^&*' for c in password):
-            char_set += 8
+        return PasswordUtils.entropy_for(len(password), PasswordUtils.char_classes(password))
+
+    @staticmethod
+    def analyze_wordlist(passwords: Iterable[str], chunk_size: int = 100000) -> Dict[str, Any]:
+        """Analyze password list in a single pass of batched chunks"""
+        analyzer = WordlistAnalyzer()
+        if isinstance(passwords, WordBatch):
+            analyzer.feed_batch(passwords)
+            return analyzer.result()
+        passwords = iter(passwords)
+        while True:
+            chunk = list(itertools.islice(passwords, chunk_size))
+            if not chunk:
+                break
+            analyzer.feed(chunk)
+        return analyzer.result()
+
+    @staticmethod
+    def analyze_file(filename: str, block_size: int = 8 * 1048576) -> Dict[str, Any]:
+        """Analyze a text wordlist in streaming blocks without loading it fully"""
+        analyzer = WordlistAnalyzer()
+        with PasswordUtils.open_binary(filename) as f:
+            remainder = b''
+            while True:
+                block = f.read(block_size)
+                if not block:
+                    break
+                block = remainder + block
+                cut = block.rfind(b'\n') + 1
+                remainder = block[cut:]
+                if cut:
+                    analyzer.feed_bytes(block[:cut])
+            if remainder:
+                analyzer.feed_bytes(remainder + b'\n')
+        return analyzer.result()
+
+class _SpillFile:
+    """Temporary file of unique words, removed once no WordSource or shard view references it.
+    
+    Copies unpickled in worker processes get no finalizer, so only the
+    process that wrote the file removes it.
+    """
+    
+    def __init__(self, path: str, count: int):
+        self.path = path
+        self.count = count
+        weakref.finalize(self, os.remove, path)
+
+class WordSource:
+    """Re-iterable streaming view of keyword/name files.
+    
+    The first pass reads the files (memory-mapped or decompressed on the fly),
+    normalizes each line, drops duplicates exactly and spills the unique words
+    to a temporary file; every later pass, including shard views, just reads
+    that file back, so generators can consume millions of inputs without a list.
+    Per-file stats come from that first pass.
+    """
+    
+    def __init__(self, paths: Iterable[str] = (), extra: Iterable[str] = (), lowercase: bool = False,
+                 max_length: int = 256, temp_dir: str = None):
+        self.paths = list(paths)
+        for path in self.paths:
+            if not os.path.exists(path):
+                raise FileNotFoundError(f"Input file not found: {path}")
+        self.extra = list(extra)
+        self.lowercase = lowercase
+        self.max_length = max_length
+        self.temp_dir = temp_dir
+        self.shard_index = 0
+        self.shard_count = 1
+        self.stats = {}
+        self._spill = None
+    
+    def __len__(self) -> int:
+        return len(range(self.shard_index, self._materialize().count, self.shard_count))
+    
+    def __iter__(self) -> Iterator[str]:
+        words = self._read_spill(self._materialize())
+        if self.shard_count > 1:
+            words = itertools.islice(words, self.shard_index, None, self.shard_count)
+        return words
+    
+    def shard(self, index: int, count: int) -> 'WordSource':
+        """View of every count-th unique word starting at index"""
+        self._materialize()
+        view = copy.copy(self)
+        view.shard_index = index
+        view.shard_count = count
+        return view
+    
+    def digest(self) -> str:
+        """Cache and checkpoint key from each file's (path, size, mtime), without reading the files"""
+        files = [[os.path.abspath(path), os.stat(path).st_size, os.stat(path).st_mtime_ns]
+                 for path in self.paths]
+        key = [files, PasswordUtils.digest_words(self.extra), self.lowercase, self.max_length,
+               self.shard_index, self.shard_count]
+        return hashlib.sha256(json.dumps(key).encode('utf-8')).hexdigest()
+    
+    def _materialize(self) -> _SpillFile:
+        """Spill file shared with every shard view, normalizing and deduplicating on first use"""
+        if self._spill is None:
+            fd, path = tempfile.mkstemp(prefix='pwgen-words-', suffix='.txt', dir=self.temp_dir)
+            unique = 0
+            try:
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    for word in self._iter_unique(Deduplicator.create('exact')):
+                        f.write(f"{word}\n")
+                        unique += 1
+            except BaseException:
+                os.remove(path)
+                raise
+            self._spill = _SpillFile(path, unique)
+        return self._spill
+    
+    @staticmethod
+    def _read_spill(spill: _SpillFile) -> Iterator[str]:
+        # The generator holds the handle, so the file outlives every source that dropped it
+        with open(spill.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                yield line[:-1]
+    
+    def _iter_unique(self, dedup: Deduplicator) -> Iterator[str]:
+        inputs = [('command line', lambda: iter(self.extra))] if self.extra else []
+        inputs += [(path, lambda path=path: PasswordUtils.iter_lines(path)) for path in self.paths]
+        for label, open_lines in inputs:
+            stats = Counter(lines=0, unique=0, duplicates=0, rejected=0)
+            for line in open_lines():
+                stats['lines'] += 1
+                word = PasswordUtils.normalize_word(line, self.lowercase) if line is not None else ''
+                if not word or len(word) > self.max_length:
+                    stats['rejected'] += 1
+                elif dedup.add(word):
+                    stats['unique'] += 1
+                    yield word
+                else:
+                    stats['duplicates'] += 1
+            self.stats[label] = stats
+    
+    def report(self) -> List[str]:
+        """One summary line per input"""
+        return [f"📂 {label}: {stats['lines']:,} lines, {stats['unique']:,} unique, "
+                f"{stats['duplicates']:,} duplicates, {stats['rejected']:,} rejected"
+                for label, stats in self.stats.items()]
+
+class WordlistAlgebra:
+    """Union, intersect, subtract and top-N over wordlists larger than memory.
+    
+    Each input is counted in chunks of at most chunk_size distinct words that
+    are spilled as sorted (word, count) runs; all runs are then combined with a
+    k-way heapq.merge, so memory is bounded by the chunk size and the merge
+    fan-in rather than by the size of the lists.
+    """
+    OPERATIONS = ('union', 'intersect', 'subtract', 'top')
+    MERGE_FAN_IN = 128
+    
+    def __init__(self, chunk_size: int = 1000000, temp_dir: str = None):
+        self.chunk_size = chunk_size
+        self.temp_dir = temp_dir
+        self.spilled_bytes = 0
+        self.inputs = 0
+        self.words_out = 0
+        self._runs = []
+    
+    @staticmethod
+    def format_for(filename: str) -> str:
+        """Wordlist format implied by a (possibly compressed) filename"""
+        compression = PasswordUtils.compression_for(filename)
+        ext = os.path.splitext(filename[:len(filename) - len(compression)])[1].lower()
+        return ext[1:] if ext in ('.json', '.jsonl') else 'txt'
+    
+    def _write_run(self, pairs: Iterable[Tuple[str, int]]) -> str:
+        fd, path = tempfile.mkstemp(prefix='pwgen-set-', suffix='.txt', dir=self.temp_dir)
+        self._runs.append(path)
+        with os.fdopen(fd, 'w', encoding='utf-8', newline='\n') as f:
+            f.writelines(f"{word}\t{count}\n" for word, count in pairs)
+        self.spilled_bytes += os.path.getsize(path)
+        return path
+    
+    @staticmethod
+    def _read_run(path: str, index: int = 0) -> Iterator[Tuple[str, int, str]]:
+        """Yield (word, input index, count text); counts are only parsed when summed"""
+        with open(path, 'r', encoding='utf-8', newline='\n') as f:
+            for line in f:
+                word, _, count = line[:-1].rpartition('\t')
+                yield word, index, count
+    
+    @staticmethod
+    def _combine(runs: List[Iterator[Tuple[str, int, str]]]) -> Iterator[Tuple[str, int]]:
+        """Merge sorted runs, summing the counts of equal words"""
+        for word, entries in itertools.groupby(heapq.merge(*runs), key=operator.itemgetter(0)):
+            yield word, sum(int(entry[2]) for entry in entries)
+    
+    def _remove(self, paths: List[str]):
+        for path in paths:
+            os.remove(path)
+            self._runs.remove(path)
+    
+    def spill(self, filename: str, max_runs: int = None) -> List[str]:
+        """Count a wordlist into at most max_runs sorted runs of distinct words"""
+        paths = []
+        counts = Counter()
+        for word in PasswordUtils.iter_wordlist(filename, self.format_for(filename)):
+            if word:
+                counts[word] += 1
+                if len(counts) >= self.chunk_size:
+                    paths.append(self._write_run(sorted(counts.items())))
+                    counts = Counter()
+        if counts or not paths:
+            paths.append(self._write_run(sorted(counts.items())))
+        counts = None
         
-        if char_set == 0:
-            return 0
+        # Keep the number of simultaneously open runs bounded by pre-merging groups
+        max_runs = max(1, max_runs or self.MERGE_FAN_IN)
+        while len(paths) > max_runs:
+            merged = []
+            for start in range(0, len(paths), self.MERGE_FAN_IN):
+                group = paths[start:start + self.MERGE_FAN_IN]
+                merged.append(self._write_run(self._combine([self._read_run(path) for path in group])))
+                self._remove(group)
+            paths = merged
+        return paths
+    
+    def iter_result(self, operation: str, inputs: List[str], top: int = 1000) -> Iterator[str]:
+        """Stream the result of operation over the input wordlists.
+        
+        union, intersect and subtract (first input minus all others) yield
+        sorted distinct words; top yields the top most frequent words across
+        all inputs, most frequent first.
+        """
+        if operation not in self.OPERATIONS:
+            raise ValueError(f"Unknown wordlist operation: {operation}")
+        if operation in ('intersect', 'subtract') and len(inputs) < 2:
+            raise ValueError(f"{operation} needs at least two inputs")
         
-        entropy = len(password) * (char_set ** 0.5)
-        return round(entropy, 2)
+        self.inputs = len(inputs)
+        try:
+            spilled = [self.spill(filename, max(1, self.MERGE_FAN_IN // len(inputs))) for filename in inputs]
+            # Beyond the fan-in, reduce groups of inputs in tiers first: intersections and unions
+            # of groups are exact partial results, and subtract only needs the union of the rest
+            head = spilled[:1] if operation == 'subtract' else []
+            rest = spilled[len(head):]
+            tier_operation = 'intersect' if operation == 'intersect' else 'union'
+            while len(head) + len(rest) > self.MERGE_FAN_IN:
+                rest = [self._reduce(tier_operation, rest[start:start + self.MERGE_FAN_IN])
+                        for start in range(0, len(rest), self.MERGE_FAN_IN)]
+            
+            # One k-way merge over every input's runs; equal words from all inputs come out together
+            runs = [self._read_run(path, index) for index, paths in enumerate(head + rest) for path in paths]
+            input_count = len(head) + len(rest)
+            grouped = itertools.groupby(heapq.merge(*runs), key=operator.itemgetter(0))
+            if operation == 'top':
+                totals = ((word, sum(int(entry[2]) for entry in entries)) for word, entries in grouped)
+                # nlargest is stable, so equally frequent words keep their sorted order
+                words = [word for word, _ in heapq.nlargest(top, totals, key=lambda pair: pair[1])]
+            else:
+                words = self._select(operation, grouped, input_count)
+            for word in words:
+                self.words_out += 1
+                yield word
+        finally:
+            self._remove(list(self._runs))
+    
+    def _reduce(self, operation: str, group: List[List[str]]) -> List[str]:
+        """Merge a group of inputs' runs into one run of their union or intersection, summing counts"""
+        runs = [self._read_run(path, index) for index, paths in enumerate(group) for path in paths]
+        grouped = ((word, list(entries))
+                   for word, entries in itertools.groupby(heapq.merge(*runs), key=operator.itemgetter(0)))
+        if operation == 'intersect':
+            grouped = ((word, entries) for word, entries in grouped
+                       if len({entry[1] for entry in entries}) == len(group))
+        path = self._write_run((word, sum(int(entry[2]) for entry in entries)) for word, entries in grouped)
+        self._remove([path for paths in group for path in paths])
+        return [path]
+    
+    @staticmethod
+    def _select(operation: str, grouped, input_count: int) -> Iterator[str]:
+        if operation == 'union':
+            for word, _ in grouped:
+                yield word
+        elif operation == 'intersect':
+            for word, entries in grouped:
+                if len({entry[1] for entry in entries}) == input_count:
+                    yield word
+        else:
+            for word, entries in grouped:
+                if all(entry[1] == 0 for entry in entries):
+                    yield word
+    
+    def report(self) -> str:
+        return (f"🧮 Wordlist {self.inputs} inputs -> {self.words_out:,} words, "
+                f"{self.spilled_bytes / 1048576:.2f} MB spilled")
+
+class PasswordPolicy:
+    """Target password policy (length window, required classes, allow/deny regex).
+    
+    Masks and the combinator prune whole branches whose completions cannot
+    satisfy the length window or the required character classes; levels,
+    rules, walks, Markov and random output are checked per candidate.
+    Pruned candidates are counted per stage.
+    """
+    CLASS_NAMES = {
+        'lower': PasswordUtils.LOWER,
+        'upper': PasswordUtils.UPPER,
+        'digit': PasswordUtils.DIGIT,
+        'special': PasswordUtils.SPECIAL
+    }
+    
+    def __init__(self, min_length: int = 0, max_length: int = None, require: Iterable[str] = (),
+                 allow: str = None, deny: str = None):
+        self.min_length = min_length or 0
+        self.max_length = max_length
+        self.required = 0
+        for name in require:
+            if name not in self.CLASS_NAMES:
+                raise ValueError(f"Unknown character class {name!r}; use {', '.join(self.CLASS_NAMES)}")
+            self.required |= self.CLASS_NAMES[name]
+        self.allow = re.compile(allow) if allow else None
+        self.deny = re.compile(deny) if deny else None
+        self.pruned = Counter()
+    
+    def check(self, password: str) -> bool:
+        """True if a finished candidate satisfies the policy"""
+        length = len(password)
+        if length < self.min_length or (self.max_length is not None and length > self.max_length):
+            return False
+        if self.required and PasswordUtils.char_classes(password) & self.required != self.required:
+            return False
+        if self.allow is not None and not self.allow.search(password):
+            return False
+        if self.deny is not None and self.deny.search(password):
+            return False
+        return True
+    
+    def can_complete(self, min_length: int, max_length: float, classes: int) -> bool:
+        """Whether some completion with this length range and reachable classes can pass"""
+        if min_length > (math.inf if self.max_length is None else self.max_length):
+            return False
+        if max_length < self.min_length:
+            return False
+        return classes & self.required == self.required
+    
+    def filter(self, candidates: Iterable[str], stage: str) -> Iterator[str]:
+        """Yield candidates that pass, counting the rest against stage"""
+        check = self.check
+        pruned = 0
+        try:
+            for password in candidates:
+                if check(password):
+                    yield password
+                else:
+                    pruned += 1
+        finally:
+            self.pruned[stage] += pruned
+    
+    def report(self) -> str:
+        """Pruned counts per stage"""
+        stages = ', '.join(f"{stage} {count:,}" for stage, count in self.pruned.items())
+        return f"🛡️  Policy pruned {sum(self.pruned.values()):,} candidates ({stages or 'none'})"
 
+class WordBatch:
+    """Candidates packed as newline-terminated UTF-8 in shared buffers plus end-offset arrays.
+    
+    A word costs its bytes and a 4-byte offset instead of a str object.
+    Segments are (buffer, ends, first, stop) views: slicing narrows a view and
+    concatenation chains views, so neither copies candidate data, and the
+    buffers can be handed to writelines or NumPy as they are.
+    """
+    __slots__ = ('_segments', '_length')
+    
+    def __init__(self, segments: List[Tuple[bytes, array, int, int]] = ()):
+        self._segments = [segment for segment in segments if segment[3] > segment[2]]
+        self._length = sum(stop - first for _, _, first, stop in self._segments)
+    
     @staticmethod
-    def analyze_wordlist(passwords: List[str]) -> Dict[str, Any]:
-        """Analyze password list"""
+    def _segment(data: bytes) -> Tuple[bytes, array, int, int]:
+        """Index a newline-terminated block"""
+        if np is not None:
+            ends = np.flatnonzero(np.frombuffer(data, dtype=np.uint8) == 10) + 1
+            offsets = array('I' if len(data) < 1 << 32 else 'Q')
+            offsets.frombytes(ends.astype(np.uint32 if offsets.typecode == 'I' else np.uint64).tobytes())
+        else:
+            offsets = array('I' if len(data) < 1 << 32 else 'Q',
+                            itertools.accumulate(len(line) for line in data.splitlines(keepends=True)))
+        return data, offsets, 0, len(offsets)
+    
+    @classmethod
+    def from_words(cls, words: Iterable[str], chunk_size: int = 65536) -> 'WordBatch':
+        """Pack words chunk by chunk, so at most chunk_size str objects exist at once"""
+        words = iter(words)
+        segments = []
+        for chunk in iter(lambda: list(itertools.islice(words, chunk_size)), []):
+            data = ('\n'.join(chunk) + '\n').encode('utf-8')
+            if data.count(b'\n') != len(chunk):
+                raise ValueError("Candidates must not contain newlines")
+            segments.append(cls._segment(data))
+        return cls(segments)
+    
+    @classmethod
+    def from_buffer(cls, data: bytes) -> 'WordBatch':
+        """Wrap a block of newline-terminated UTF-8 words without copying it"""
+        if data and not data.endswith(b'\n'):
+            raise ValueError("Buffer must be newline-terminated")
+        return cls([cls._segment(bytes(data))] if data else [])
+    
+    @classmethod
+    def chain(cls, batches: Iterable['WordBatch']) -> 'WordBatch':
+        return cls([segment for batch in batches for segment in batch._segments])
+    
+    def __len__(self) -> int:
+        return self._length
+    
+    def __add__(self, other: 'WordBatch') -> 'WordBatch':
+        if not isinstance(other, WordBatch):
+            return NotImplemented
+        return WordBatch(self._segments + other._segments)
+    
+    @staticmethod
+    def _span(segment: Tuple[bytes, array, int, int]) -> Tuple[int, int]:
+        """Byte range of a segment view"""
+        _, ends, first, stop = segment
+        return (ends[first - 1] if first else 0), ends[stop - 1]
+    
+    def __iter__(self) -> Iterator[str]:
+        for segment in self._segments:
+            start, end = self._span(segment)
+            yield from str(memoryview(segment[0])[start:end - 1], 'utf-8').split('\n')
+    
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            start, stop, step = item.indices(self._length)
+            if step != 1:
+                raise ValueError("WordBatch slices must be contiguous")
+            segments = []
+            for data, ends, first, last in self._segments:
+                size = last - first
+                if stop > 0 and start < size:
+                    segments.append((data, ends, first + max(0, start), first + min(size, stop)))
+                start -= size
+                stop -= size
+            return WordBatch(segments)
+        
+        index = item + self._length if item < 0 else item
+        if not 0 <= index < self._length:
+            raise IndexError("WordBatch index out of range")
+        for data, ends, first, stop in self._segments:
+            if index < stop - first:
+                position = first + index
+                return str(memoryview(data)[(ends[position - 1] if position else 0):ends[position] - 1], 'utf-8')
+            index -= stop - first
+    
+    def __repr__(self) -> str:
+        return f"WordBatch({self._length} words, {self.nbytes} bytes)"
+    
+    @property
+    def nbytes(self) -> int:
+        """Size of the newline-terminated UTF-8 data"""
+        return sum(end - start for start, end in map(self._span, self._segments))
+    
+    def memory_bytes(self) -> int:
+        """Bytes held by the underlying buffers and offset arrays"""
+        seen = {}
+        for data, ends, _, _ in self._segments:
+            seen[id(data)] = len(data) + len(ends) * ends.itemsize
+        return sum(seen.values())
+    
+    def buffers(self) -> List[memoryview]:
+        """Zero-copy views of the newline-terminated data, segment by segment"""
+        return [memoryview(segment[0])[slice(*self._span(segment))] for segment in self._segments]
+    
+    def arrays(self) -> List['np.ndarray']:
+        """Read-only uint8 NumPy views of the buffers"""
+        return [np.frombuffer(buffer, dtype=np.uint8) for buffer in self.buffers()]
+    
+    def write_to(self, stream) -> int:
+        """Write the words, newline-terminated, straight from the buffers"""
+        buffers = self.buffers()
+        stream.writelines(buffers)
+        return sum(map(len, buffers))
+    
+    def tolist(self) -> List[str]:
+        return list(self)
+
+class WordlistAnalyzer:
+    """Accumulate length/entropy statistics over chunks, vectorized with NumPy when available.
+    
+    Entropy depends only on (length, class bitmask), so each chunk is reduced
+    to counts of distinct pairs and the entropy is evaluated once per pair.
+    """
+    ENTROPY_BUCKET = 10
+    
+    def __init__(self):
+        self.pair_counts = Counter()
+    
+    def feed(self, passwords: List[str]):
+        """Add a chunk of passwords"""
+        if np is not None:
+            joined = '\n'.join(passwords) + '\n'
+            if joined.isascii():
+                self._feed_array(np.frombuffer(joined.encode('ascii'), dtype=np.uint8))
+                return
+        self.pair_counts.update(
+            (len(password), PasswordUtils.char_classes(password)) for password in passwords
+        )
+    
+    def feed_batch(self, batch: 'WordBatch'):
+        """Add a WordBatch, reading ASCII buffers in place through NumPy views"""
+        if np is None:
+            self.feed(batch.tolist())
+            return
+        for buffer in batch.arrays():
+            if buffer.max() < 128:
+                self._feed_array(buffer)
+            else:
+                self.feed(str(buffer.tobytes(), 'utf-8').split('\n')[:-1])
+    
+    def feed_bytes(self, block: bytes):
+        """Add a newline-terminated block of UTF-8 encoded passwords"""
+        if np is not None and block.isascii():
+            self._feed_array(np.frombuffer(block, dtype=np.uint8))
+        else:
+            self.feed(block.decode('utf-8').split('\n')[:-1])
+    
+    def _feed_array(self, buffer: 'np.ndarray'):
+        ends = np.flatnonzero(buffer == 10)
+        if len(ends) == 0:
+            return
+        starts = np.empty_like(ends)
+        starts[0] = 0
+        starts[1:] = ends[:-1] + 1
+        lengths = ends - starts
+        masks = np.bitwise_or.reduceat(_CLASS_TABLE[buffer], starts)
+        pairs, counts = np.unique(lengths * 16 + masks, return_counts=True)
+        for pair, count in zip(pairs.tolist(), counts.tolist()):
+            self.pair_counts[(pair >> 4, pair & 15)] += count
+    
+    def result(self) -> Dict[str, Any]:
+        """Statistics in the analyze_wordlist format plus histograms"""
+        total = sum(self.pair_counts.values())
         analysis = {
-            'total_passwords': len(passwords),
+            'total_passwords': total,
             'avg_length': 0,
-            'min_length': float('inf'),
+            'min_length': 0,
             'max_length': 0,
             'entropy_stats': {
-                'min': float('inf'),
+                'min': 0,
                 'max': 0,
                 'avg': 0
-            }
+            },
+            'length_histogram': {},
+            'entropy_histogram': {}
         }
+        if total == 0:
+            return analysis
         
+        length_histogram = Counter()
+        entropy_histogram = Counter()
+        entropies = []
         total_length = 0
         total_entropy = 0
+        for (length, mask), count in self.pair_counts.items():
+            entropy = PasswordUtils.entropy_for(length, mask)
+            entropies.append(entropy)
+            total_length += length * count
+            total_entropy += entropy * count
+            length_histogram[length] += count
+            entropy_histogram[int(entropy // self.ENTROPY_BUCKET * self.ENTROPY_BUCKET)] += count
         
-        for password in passwords:
-            length = len(password)
-            total_length += length
-            analysis['min_length'] = min(analysis['min_length'], length)
-            analysis['max_length'] = max(analysis['max_length'], length)
+        analysis['avg_length'] = round(total_length / total, 2)
+        analysis['min_length'] = min(length_histogram)
+        analysis['max_length'] = max(length_histogram)
+        analysis['entropy_stats'] = {
+            'min': min(entropies),
+            'max': max(entropies),
+            'avg': round(total_entropy / total, 2)
+        }
+        analysis['length_histogram'] = dict(sorted(length_histogram.items()))
+        analysis['entropy_histogram'] = dict(sorted(entropy_histogram.items()))
+        return analysis
+
+def _build_class_table() -> 'np.ndarray':
+    """Byte -> character-class bit lookup for ASCII buffers"""
+    table = np.zeros(256, dtype=np.uint8)
+    for byte in range(128):
+        table[byte] = PasswordUtils.char_classes(chr(byte))
+    return table
+
+_CLASS_TABLE = _build_class_table() if np is not None else None
+
+class WordlistWriter:
+    """Batched, optionally compressed and threaded wordlist output.
+    
+    Candidates are joined into large blocks before each write. json output is
+    an incremental array with the metadata written after the passwords, since
+    the total is only known at the end. With atomic=True the file is written
+    under a temporary name and renamed into place on close. Leaving a with
+    block on an exception aborts instead of closing: output keeps only what
+    was already emitted, and the original error is never masked by one from
+    finishing the output.
+    """
+    
+    def __init__(self, filename: str, format_type: str = 'txt', batch_size: int = 65536,
+                 background: bool = False, atomic: bool = False, append: bool = False):
+        if format_type not in ('txt', 'json', 'jsonl'):
+            raise ValueError(f"Unknown output format: {format_type}")
+        if append and (atomic or format_type == 'json'):
+            raise ValueError("Appending is only supported for non-atomic txt/jsonl output")
+        self.filename = filename
+        self.format_type = format_type
+        self.batch_size = batch_size
+        self.path = f"{filename}.part" if atomic else filename
+        self.atomic = atomic
+        self.count = 0
+        self.bytes_written = 0
+        self._batch = []
+        self._io_seconds = 0.0
+        self._stream = PasswordUtils.open_binary(self.path, 'ab' if append else 'wb',
+                                                 PasswordUtils.compression_for(filename))
+        self._queue = None
+        self._thread = None
+        self._error = None
+        if background:
+            self._queue = queue.Queue(maxsize=8)
+            self._thread = threading.Thread(target=self._drain, name='wordlist-writer', daemon=True)
+            self._thread.start()
+        if format_type == 'json':
+            self._emit(b'{\n  "passwords": [')
+    
+    def __enter__(self) -> 'WordlistWriter':
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            self.abort()
+        else:
+            self.close()
+    
+    def _drain(self):
+        while True:
+            data = self._queue.get()
+            try:
+                if data is None:
+                    return
+                if self._error is None:
+                    self._write(data)
+            except Exception as e:
+                self._error = e
+            finally:
+                self._queue.task_done()
+    
+    def _emit(self, data: bytes):
+        self.bytes_written += len(data)
+        if self._queue is not None:
+            if self._error is not None:
+                raise self._error
+            self._queue.put(data)
+        else:
+            self._write(data)
+    
+    def _write(self, data: bytes):
+        start = time.perf_counter()
+        self._stream.write(data)
+        self._io_seconds += time.perf_counter() - start
+    
+    def _encode(self, batch: List[str]) -> bytes:
+        if self.format_type == 'txt':
+            return ('\n'.join(batch) + '\n').encode('utf-8')
+        if self.format_type == 'jsonl':
+            return ('\n'.join(map(json.dumps, batch)) + '\n').encode('utf-8')
+        separator = ',' if self.count > len(batch) else ''
+        return (separator + ','.join('\n    ' + json.dumps(p) for p in batch)).encode('utf-8')
+    
+    def write(self, password: str):
+        """Queue one password for output"""
+        self._batch.append(password)
+        if len(self._batch) >= self.batch_size:
+            self._flush_batch()
+    
+    def write_many(self, passwords: Iterable[str]):
+        """Write an iterable of passwords in batch-sized blocks"""
+        passwords = iter(passwords)
+        while True:
+            if self._batch:
+                self._flush_batch()
+            self._batch = list(itertools.islice(passwords, self.batch_size))
+            if not self._batch:
+                return
+            self._flush_batch()
+    
+    def write_batch(self, batch: 'WordBatch'):
+        """Write a WordBatch; txt output goes straight from its buffers"""
+        if self.format_type != 'txt':
+            self.write_many(batch)
+            return
+        self._flush_batch()
+        self.count += len(batch)
+        for buffer in batch.buffers():
+            self._emit(buffer)
+    
+    def _flush_batch(self):
+        batch, self._batch = self._batch, []
+        self.count += len(batch)
+        if batch:
+            self._emit(self._encode(batch))
+    
+    def flush(self):
+        """Push everything written so far to the operating system"""
+        self._flush_batch()
+        if self._queue is not None:
+            self._queue.join()
+            if self._error is not None:
+                raise self._error
+        self._stream.flush()
+    
+    def tell(self) -> int:
+        """Bytes of output flushed so far (uncompressed)"""
+        return self.bytes_written
+    
+    def close(self):
+        """Finish the output, stop the writer thread and rename into place"""
+        if self._stream is None:
+            return
+        self._flush_batch()
+        if self.format_type == 'json':
+            metadata = {
+                'total_passwords': self.count,
+                'generated_at': time.strftime('%Y-%m-%d %H:%M:%S'),
+                'wordlist_name': os.path.splitext(self.filename)[0]
+            }
+            metadata = json.dumps(metadata, indent=2).replace('\n', '\n  ')
+            self._emit(f'\n  ],\n  "metadata": {metadata}\n}}\n'.encode('utf-8'))
+        self._stop_thread()
+        self._stream.close()
+        self._stream = None
+        if self._error is not None:
+            raise self._error
+        if self.atomic:
+            os.replace(self.path, self.filename)
+    
+    def abort(self):
+        """Stop writing without finishing the output, discarding it if atomic; never raises"""
+        if self._stream is None:
+            return
+        self._stop_thread()
+        with contextlib.suppress(OSError):
+            self._stream.close()
+        self._stream = None
+        if self.atomic:
+            with contextlib.suppress(OSError):
+                os.remove(self.path)
+    
+    def _stop_thread(self):
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+    
+    def report(self) -> str:
+        """Throughput summary for the output written so far"""
+        megabytes = self.bytes_written / 1048576
+        rate = megabytes / self._io_seconds if self._io_seconds else 0.0
+        return f"📝 Wrote {megabytes:.2f} MB in {self._io_seconds:.2f}s of I/O ({rate:.1f} MB/s)"
+
+class GenerationCheckpoint:
+    """Periodic checkpoints of a comprehensive run so it can resume after interruption.
+    
+    A checkpoint records only the generator stage, position and RNG state, so
+    it is cheap to write every few seconds. The dedup state is rebuilt on
+    resume by replaying the output file; candidates written after the last
+    checkpoint are then regenerated and dropped as duplicates, so resumed
+    output has no duplicates and no gaps.
+    """
+    VERSION = 1
+    RESUMABLE_FORMATS = ('txt', 'jsonl')
+    
+    def __init__(self, path: str, interval: float = 5.0):
+        self.path = path
+        self.interval = interval
+    
+    def save(self, state: GenerationState, config: Dict[str, Any]):
+        """Atomically write the checkpoint file"""
+        data = {
+            'version': self.VERSION,
+            'saved_at': time.strftime('%Y-%m-%d %H:%M:%S'),
+            'config': config,
+            'state': state.to_dict()
+        }
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+        os.replace(temp_path, self.path)
+    
+    def load(self) -> Dict[str, Any]:
+        """Read the checkpoint file, or None if there is none"""
+        if not os.path.exists(self.path):
+            return None
+        with open(self.path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get('version') != self.VERSION:
+            raise ValueError(f"Unsupported checkpoint version in {self.path}")
+        return data
+    
+    @staticmethod
+    def _recover_output(filename: str, format_type: str, dedup: Deduplicator) -> int:
+        """Drop a trailing partial line and replay the output into the dedup engine"""
+        if not os.path.exists(filename):
+            return 0
+        with open(filename, 'r+b') as f:
+            end = f.seek(0, os.SEEK_END)
+            position = end
+            while position > 0:
+                start = max(0, position - 65536)
+                f.seek(start)
+                newline = f.read(position - start).rfind(b'\n')
+                if newline != -1:
+                    position = start + newline + 1
+                    break
+                position = start
+            if position != end:
+                f.truncate(position)
+        
+        for password in PasswordUtils.iter_wordlist(filename, format_type):
+            dedup.add(password)
+            dedup.unique += 1
+        return dedup.unique
+    
+    def run(self, generator: 'PasswordListGenerator', dedup: Deduplicator, keywords: List[str],
+            names: List[str], total_count: int, output: str, format_type: str = 'txt',
+            resume: bool = False, options: Dict[str, Any] = None, background: bool = False,
+            policy: 'PasswordPolicy' = None, stats: 'RunStats' = None) -> int:
+        """Generate a comprehensive list into output, checkpointing as it goes"""
+        inputs = [PasswordUtils.digest_words(keywords), PasswordUtils.digest_words(names)]
+        config = dict(options or {}, inputs=inputs, count=total_count, output=output, format=format_type)
+        
+        state = GenerationState()
+        append = False
+        if resume:
+            data = self.load()
+            if data is None:
+                print(f"⚠️  No checkpoint at {self.path}, starting from the beginning")
+            elif data['config'] != config:
+                raise ValueError(f"Checkpoint {self.path} was written with different options")
+            else:
+                state = GenerationState.from_dict(data['state'])
+                state.emitted = self._recover_output(output, format_type, dedup)
+                append = True
+                print(f"♻️  Resuming at stage {state.stage}, position {state.position} "
+                      f"({state.emitted} passwords already written)")
+        
+        stream = generator.iter_comprehensive_list(keywords, names, total_count, dedup, state, policy,
+                                                   stats=stats)
+        if stats is not None:
+            stream = stats.counted('written', stream)
+        writer = WordlistWriter(output, format_type, background=background, append=append)
+        last_saved = time.monotonic()
+        try:
+            for written, password in enumerate(stream, 1):
+                writer.write(password)
+                if written & 4095 == 0 and time.monotonic() - last_saved >= self.interval:
+                    writer.flush()
+                    self.save(state, config)
+                    last_saved = time.monotonic()
+        except KeyboardInterrupt:
+            writer.flush()
+            self.save(state, config)
+            print(f"\n💾 Checkpoint saved to {self.path}; rerun with --resume to continue")
+            raise
+        finally:
+            writer.close()
+        
+        if os.path.exists(self.path):
+            os.remove(self.path)
+        total = state.emitted + writer.count
+        print(f"💾 Wordlist saved to {output} with {total} passwords")
+        print(writer.report())
+        return total
+
+def _random_chunk(task: Tuple[type, int, int, int, Dict[str, Any]]) -> str:
+    """Pool worker: one chunk of random candidates, newline-joined to keep pickling cheap"""
+    cls, seed, chunk, chunk_size, options = task
+    return '\n'.join(cls(seed, stream=chunk, **options).take(chunk_size))
+
+def _generate_shard(task: Dict[str, Any]) -> Tuple[str, Counter, int]:
+    """Pool worker: generate one shard's candidates into a temporary file"""
+    generator = PasswordListGenerator(seed=task['seed'])
+    layout, generator.max_walk_turns = task['keyboard']
+    generator.keyboard = KeyboardWalker(layout)
+    policy = task['policy']
+    fd, path = tempfile.mkstemp(prefix=f"pwgen-shard{task['index']}-", suffix='.txt',
+                                dir=task['temp_dir'])
+    generated = 0
+    with os.fdopen(fd, 'w', encoding='utf-8') as f, contextlib.redirect_stdout(io.StringIO()):
+        for level, quota in task['stages']:
+            candidates = generator.iter_level(level, task['keywords'], task['names'])
+            if policy is not None:
+                before = sum(policy.pruned.values())
+                candidates = policy.filter(candidates, level)
+            written = 0
+            for written, password in enumerate(itertools.islice(candidates, quota), 1):
+                f.write(f"{password}\n")
+            generated += written
+            if policy is not None:
+                # Closing the filter settles its pruned count before it is read
+                candidates.close()
+                generated += sum(policy.pruned.values()) - before
+    return path, policy.pruned if policy is not None else Counter(), generated
+
+class ShardedGenerator:
+    """Split the keyword/name input space into deterministic shards across a process pool"""
+    
+    def __init__(self, workers: int, seed: int = 0, dedup: Deduplicator = None,
+                 temp_dir: str = None, policy: 'PasswordPolicy' = None,
+                 keyboard_layout: str = 'qwerty', max_walk_turns: int = 1, stats: 'RunStats' = None):
+        self.workers = max(1, workers)
+        self.seed = seed
+        self.dedup = dedup or Deduplicator.create('exact')
+        self.temp_dir = temp_dir
+        self.policy = policy
+        self.keyboard = (keyboard_layout, max_walk_turns)
+        self.stats = stats
+    
+    def shard_seed(self, index: int) -> int:
+        """Derive an independent, reproducible seed for a shard"""
+        digest = hashlib.sha256(f"{self.seed}:{self.workers}:{index}".encode()).digest()
+        return int.from_bytes(digest[:8], 'little')
+    
+    def build_tasks(self, level: str, keywords: List[str], names: List[str],
+                    total_count: int) -> List[Dict[str, Any]]:
+        """Assign inputs and per-level quotas to each shard"""
+        def split(words, index):
+            if isinstance(words, WordSource):
+                return words.shard(index, self.workers)
+            return words[index::self.workers]
+        
+        keywords = keywords if isinstance(keywords, WordSource) else list(keywords or [])
+        names = names if isinstance(names, WordSource) else list(names or [])
+        shards = [{
+            'index': index,
+            'seed': self.shard_seed(index),
+            'temp_dir': self.temp_dir,
+            'policy': self.policy,
+            'keyboard': self.keyboard,
+            # Without user keywords the levels fall back to their defaults once, in shard 0
+            'keywords': split(keywords, index) if keywords else (None if index == 0 else []),
+            'names': split(names, index),
+            'stages': []
+        } for index in range(self.workers)]
+        
+        if level == 'all':
+            shares = PasswordListGenerator.LEVEL_SHARES
+        else:
+            shares = [(level, 1.0)]
+        
+        for stage, share in shares:
+            if stage == 'beginner':
+                owners = shards[:1]
+            elif stage == 'names':
+                owners = [shard for shard in shards if shard['names']]
+            else:
+                owners = [shard for shard in shards if shard['keywords'] is None or shard['keywords']]
+            if not owners:
+                continue
+            quota = int(total_count * share)
+            base, extra = divmod(quota, len(owners))
+            for position, shard in enumerate(owners):
+                shard['stages'].append((stage, base + (1 if position < extra else 0)))
+        
+        return [shard for shard in shards if shard['stages']]
+    
+    def iter_candidates(self, level: str, keywords: List[str] = None, names: List[str] = None,
+                        total_count: int = 1000) -> Iterator[str]:
+        """Generate shards in parallel and merge them in shard order with cross-shard dedup"""
+        tasks = self.build_tasks(level, keywords, names, total_count)
+        print(f"⚡ Generating {len(tasks)} shards on {self.workers} workers (seed {self.seed})...")
+        
+        paths = []
+        with multiprocessing.Pool(self.workers) as pool:
+            def shard_files():
+                # imap keeps shard order, so merging starts while later shards still run
+                for path, pruned, generated in pool.imap(_generate_shard, tasks):
+                    paths.append(path)
+                    if self.policy is not None:
+                        self.policy.pruned.update(pruned)
+                    if self.stats is not None:
+                        self.stats.counters['generated'] += generated
+                    yield path
             
-            entropy = PasswordUtils.calculate_entropy(password)
-            total_entropy += entropy
-            analysis['entropy_stats']['min'] = min(analysis['entropy_stats']['min'], entropy)
-            analysis['entropy_stats']['max'] = max(analysis['entropy_stats']['max'], entropy)
+            merged = itertools.chain.from_iterable(
+                PasswordUtils.iter_wordlist(path) for path in shard_files()
+            )
+            try:
+                yield from itertools.islice(self.dedup.filter(merged), total_count)
+            finally:
+                for path in paths:
+                    if os.path.exists(path):
+                        os.remove(path)
+
+def _md4(data: bytes) -> bytes:
+    """Pure-Python MD4 (RFC 1320), for OpenSSL builds that no longer provide it"""
+    mask = 0xffffffff
+    
+    def rotl(x: int, n: int) -> int:
+        x &= mask
+        return ((x << n) | (x >> (32 - n))) & mask
+    
+    length = len(data)
+    data = data + b'\x80' + b'\x00' * ((55 - length) % 64) + struct.pack('<Q', length * 8 & 0xffffffffffffffff)
+    a, b, c, d = 0x67452301, 0xefcdab89, 0x98badcfe, 0x10325476
+    for offset in range(0, len(data), 64):
+        x = struct.unpack_from('<16I', data, offset)
+        aa, bb, cc, dd = a, b, c, d
+        for i in range(16):
+            a = rotl(a + ((b & c) | (~b & d)) + x[i], (3, 7, 11, 19)[i % 4])
+            a, b, c, d = d, a, b, c
+        for i in range(16):
+            a = rotl(a + ((b & c) | (b & d) | (c & d)) + x[(i % 4) * 4 + i // 4] + 0x5a827999,
+                     (3, 5, 9, 13)[i % 4])
+            a, b, c, d = d, a, b, c
+        for i in range(16):
+            a = rotl(a + (b ^ c ^ d) + x[(0, 8, 4, 12, 2, 10, 6, 14, 1, 9, 5, 13, 3, 11, 7, 15)[i]] + 0x6ed9eba1,
+                     (3, 9, 11, 15)[i % 4])
+            a, b, c, d = d, a, b, c
+        a, b, c, d = (a + aa) & mask, (b + bb) & mask, (c + cc) & mask, (d + dd) & mask
+    return struct.pack('<4I', a, b, c, d)
+
+class HashIndex:
+    """Sorted fixed-width digests behind a 16-bit prefix table, memory-mapped for lookups.
+    
+    Layout: header, 65537 uint64 record offsets (one per leading two-byte
+    prefix, plus the end), then the sorted digests. A lookup reads two
+    offsets and binary-searches the few records sharing the prefix; most
+    misses stop at an empty bucket.
+    """
+    MAGIC = b'PWGHIDX1'
+    HEADER = struct.Struct('<8s8sIQ')
+    BUCKETS = 65536
+    
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, 'rb') as f:
+            self._buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, algorithm, self.digest_size, self.count = self.HEADER.unpack_from(self._buffer, 0)
+        if magic != self.MAGIC:
+            raise ValueError(f"{path} is not a hash index")
+        self.algorithm = algorithm.rstrip(b'\0').decode('ascii')
+        self._buckets = array('Q')
+        self._buckets.frombytes(self._buffer[self.HEADER.size:self.HEADER.size + (self.BUCKETS + 1) * 8])
+        self._data = self.HEADER.size + (self.BUCKETS + 1) * 8
+    
+    def __len__(self) -> int:
+        return self.count
+    
+    def __contains__(self, digest: bytes) -> bool:
+        prefix = digest[0] << 8 | digest[1]
+        lo, hi = self._buckets[prefix], self._buckets[prefix + 1]
+        size, data, buffer = self.digest_size, self._data, self._buffer
+        while lo < hi:
+            mid = (lo + hi) // 2
+            record = buffer[data + mid * size:data + (mid + 1) * size]
+            if record == digest:
+                return True
+            if record < digest:
+                lo = mid + 1
+            else:
+                hi = mid
+        return False
+    
+    @staticmethod
+    def parse_line(line: str, digest_size: int) -> bytes:
+        """Digest from a 'hash', 'label:hash' or pwdump-style line (None if there is none)"""
+        fields = line.strip().rstrip(':').split(':')
+        try:
+            digest = bytes.fromhex(fields[-1])
+        except ValueError:
+            return None
+        return digest if len(digest) == digest_size else None
+    
+    @classmethod
+    def build(cls, dump: str, algorithm: str, path: str) -> 'HashIndex':
+        """Index the target hashes in dump (one per line) for algorithm"""
+        size = HashAuditor.DIGEST_SIZES[algorithm]
+        digests = set()
+        for line in PasswordUtils.iter_lines(dump):
+            digest = cls.parse_line(line, size) if line else None
+            if digest is not None:
+                digests.add(digest)
+        digests = sorted(digests)
         
-        analysis['avg_length'] = round(total_length / len(passwords), 2)
-        analysis['entropy_stats']['avg'] = round(total_entropy / len(passwords), 2)
+        buckets = array('Q', [0]) * (cls.BUCKETS + 1)
+        for digest in digests:
+            buckets[(digest[0] << 8 | digest[1]) + 1] += 1
+        for prefix in range(cls.BUCKETS):
+            buckets[prefix + 1] += buckets[prefix]
         
-        return analysis
+        with open(f"{path}.part", 'wb') as f:
+            f.write(cls.HEADER.pack(cls.MAGIC, algorithm.encode('ascii'), size, len(digests)))
+            f.write(buckets.tobytes())
+            f.write(b''.join(digests))
+        os.replace(f"{path}.part", path)
+        return cls(path)
+    
+    @classmethod
+    def load(cls, dump: str, algorithm: str, path: str = None) -> 'HashIndex':
+        """Load the index for dump, (re)building it when missing or older than the dump"""
+        path = path or f"{dump}.{algorithm}.idx"
+        if os.path.exists(path) and os.path.getmtime(path) >= os.path.getmtime(dump):
+            index = cls(path)
+            if index.algorithm == algorithm:
+                return index
+        print(f"🗂️  Indexing {dump} for {algorithm}...")
+        return cls.build(dump, algorithm, path)
+
+_audit_state = None
+
+def _audit_worker_init(index_path: str, algorithm: str, prefix: str, suffix: str):
+    """Pool initializer: map the index and prepare the hash function once per worker"""
+    global _audit_state
+    _audit_state = (HashIndex(index_path), HashAuditor.digest_function(algorithm),
+                    prefix.encode('utf-8'), suffix.encode('utf-8'),
+                    'utf-16-le' if algorithm == 'ntlm' else 'utf-8')
+
+def _audit_batch(batch: str) -> Tuple[int, List[Tuple[str, str]]]:
+    """Pool worker: hash a newline-joined batch and return its count and (hex digest, password) matches"""
+    index, digest, prefix, suffix, encoding = _audit_state
+    passwords = batch.split('\n')
+    matches = []
+    for password in passwords:
+        value = digest(prefix + password.encode(encoding) + suffix)
+        if value in index:
+            matches.append((value.hex(), password))
+    return len(passwords), matches
+
+class HashAuditor:
+    """Check candidate streams against an in-house hash dump without writing the candidates out.
+    
+    Candidates are hashed in batches on a process pool; each worker maps the
+    same HashIndex, and only matches travel back to the parent. A salt is
+    applied through a format such as '{salt}{password}'.
+    """
+    DIGEST_SIZES = {'md5': 16, 'sha1': 20, 'sha256': 32, 'ntlm': 16}
+    
+    def __init__(self, index: HashIndex, salt: str = '', salt_format: str = '{password}',
+                 workers: int = 1, batch_size: int = 8192):
+        if '{password}' not in salt_format:
+            raise ValueError("Salt format must contain {password}")
+        if index.algorithm == 'ntlm' and salt_format != '{password}':
+            raise ValueError("NTLM hashes are unsalted")
+        self.index = index
+        self.prefix, self.suffix = (part.replace('{salt}', salt) for part in salt_format.split('{password}', 1))
+        self.workers = max(1, workers)
+        self.batch_size = batch_size
+        self.hashed = 0
+        self.seconds = 0.0
+        self.found = set()
+    
+    @staticmethod
+    def digest_function(algorithm: str):
+        """bytes -> digest callable; NTLM is MD4 over the UTF-16LE password"""
+        if algorithm == 'ntlm':
+            try:
+                hashlib.new('md4')
+                return lambda data: hashlib.new('md4', data).digest()
+            except ValueError:
+                return _md4
+        if algorithm not in HashAuditor.DIGEST_SIZES:
+            raise ValueError(f"Unknown hash algorithm: {algorithm}")
+        constructor = getattr(hashlib, algorithm)
+        return lambda data: constructor(data).digest()
+    
+    def audit(self, candidates: Iterable[str]) -> Iterator[Tuple[str, str]]:
+        """Yield (hex digest, password) for each target hash found, once per hash"""
+        candidates = iter(candidates)
+        batches = ('\n'.join(batch) for batch in iter(
+            lambda: list(itertools.islice(candidates, self.batch_size)), []))
+        init_args = (self.index.path, self.index.algorithm, self.prefix, self.suffix)
+        start = time.perf_counter()
+        try:
+            if self.workers > 1:
+                with multiprocessing.Pool(self.workers, _audit_worker_init, init_args) as pool:
+                    yield from self._collect(pool.imap(_audit_batch, batches))
+            else:
+                _audit_worker_init(*init_args)
+                yield from self._collect(map(_audit_batch, batches))
+        finally:
+            self.seconds += time.perf_counter() - start
+    
+    def _collect(self, results: Iterator[Tuple[int, List[Tuple[str, str]]]]) -> Iterator[Tuple[str, str]]:
+        for count, matches in results:
+            self.hashed += count
+            for digest, password in matches:
+                if digest not in self.found:
+                    self.found.add(digest)
+                    yield digest, password
+    
+    def report(self) -> str:
+        rate = self.hashed / self.seconds if self.seconds else 0.0
+        return (f"🔎 Audited {self.hashed:,} candidates ({rate:,.0f} hashes/s): "
+                f"{len(self.found):,} of {len(self.index):,} target hashes found")
+
+class RunStats:
+    """Per-stage counters, phase timings and a live progress line for one run.
+    
+    Hot loops never update a counter per candidate: wrapped streams add to
+    their stage once per batch, dedup and policy counts are read from the
+    engines' own totals, and a background thread samples them to redraw the
+    progress line. Generated counts what the sources produced before any
+    filter, so branches pruned inside a mask or combination never appear in it.
+    """
+    STAGES = ('generated', 'filtered', 'deduped', 'written')
+    
+    def __init__(self, target: int = None, dedup: Deduplicator = None, policy: 'PasswordPolicy' = None,
+                 batch_size: int = 4096, interval: float = 0.5, output=None):
+        if batch_size & (batch_size - 1):
+            raise ValueError("batch_size must be a power of two")
+        self.target = target
+        self.dedup = dedup
+        self.policy = policy
+        self.batch_size = batch_size
+        self.interval = interval
+        self.output = output or sys.stderr
+        self.counters = Counter()
+        self.timings = Counter()
+        self.started = time.perf_counter()
+        self.finished = None
+        self._stopped = threading.Event()
+        self._thread = None
+    
+    def counted(self, stage: str, candidates: Iterable[str]) -> Iterator[str]:
+        """Pass candidates through, adding them to stage once per batch"""
+        mask = self.batch_size - 1
+        n = 0
+        try:
+            for n, password in enumerate(candidates, 1):
+                yield password
+                if not n & mask:
+                    self.counters[stage] += self.batch_size
+        finally:
+            self.counters[stage] += n & mask
+    
+    def timed(self, name: str, candidates: Iterable[str]) -> Iterator[str]:
+        """Pass candidates through, timing how long each batch takes to pull into name.
+        
+        Reads up to batch_size candidates ahead, so it must not wrap a stream
+        whose producer tracks what the consumer has taken, like a checkpoint.
+        """
+        candidates = iter(candidates)
+        while True:
+            start = time.perf_counter()
+            batch = list(itertools.islice(candidates, self.batch_size))
+            self.timings[name] += time.perf_counter() - start
+            if not batch:
+                return
+            yield from batch
+    
+    @contextlib.contextmanager
+    def phase(self, name: str):
+        """Time a phase of the run, less any time credited to other phases inside it"""
+        start = time.perf_counter()
+        credited = sum(self.timings.values())
+        try:
+            yield
+        finally:
+            nested = sum(self.timings.values()) - credited
+            self.timings[name] += time.perf_counter() - start - nested
+    
+    def snapshot(self) -> Dict[str, int]:
+        """Current stage counts"""
+        return {
+            'generated': self.counters['generated'],
+            'filtered': sum(self.policy.pruned.values()) if self.policy is not None else 0,
+            'deduped': self.dedup.duplicates if self.dedup is not None else 0,
+            'written': self.counters['written']
+        }
+    
+    def rate(self) -> float:
+        elapsed = (self.finished or time.perf_counter()) - self.started
+        return self.counters['written'] / elapsed if elapsed else 0.0
+    
+    def progress_line(self) -> str:
+        counts = self.snapshot()
+        rate = self.rate()
+        line = f"⏳ {counts['written']:,}"
+        if self.target:
+            line += f"/{self.target:,} ({min(100.0, 100.0 * counts['written'] / self.target):.1f}%)"
+        line += f" {rate:,.0f}/s"
+        if self.target and rate:
+            remaining = max(0, self.target - counts['written']) / rate
+            line += f" ETA {datetime.timedelta(seconds=int(remaining))}"
+        return line + f" | filtered {counts['filtered']:,} deduped {counts['deduped']:,}"
+    
+    def start(self):
+        """Redraw the progress line every interval until stop()"""
+        def draw():
+            while not self._stopped.wait(self.interval):
+                self.output.write(f"\r{self.progress_line()}\033[K")
+                self.output.flush()
+        
+        self._thread = threading.Thread(target=draw, daemon=True)
+        self._thread.start()
+    
+    def stop(self):
+        """Freeze the rate and, if it is running, finish the progress line"""
+        self.finished = time.perf_counter()
+        if self._thread is not None:
+            self._stopped.set()
+            self._thread.join()
+            self._thread = None
+            self.output.write(f"\r{self.progress_line()}\033[K\n")
+            self.output.flush()
+    
+    def report(self) -> str:
+        counts = self.snapshot()
+        phases = ', '.join(f"{name} {seconds:.2f}s" for name, seconds in self.timings.items())
+        return ("📈 Stages: " + ', '.join(f"{stage} {counts[stage]:,}" for stage in self.STAGES) +
+                f"\n⏱️  Phases: {phases or 'none'}; {self.rate():,.0f} candidates/s overall")
+
+class RunProfiler:
+    """cProfile and tracemalloc over a whole CLI run, dumped when the process exits"""
+    
+    def __init__(self, filename: str, top: int = 30):
+        self.filename = filename
+        self.top = top
+        self.profile = None
+    
+    def start(self):
+        tracemalloc.start()
+        self.profile = cProfile.Profile()
+        self.profile.enable()
+        # Also covers runs that end early or are interrupted
+        atexit.register(self.stop)
+    
+    def stop(self):
+        if self.profile is None:
+            return
+        self.profile.disable()
+        snapshot = tracemalloc.take_snapshot()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        
+        self.profile.dump_stats(self.filename)
+        with open(f"{self.filename}.txt", 'w', encoding='utf-8') as f:
+            pstats.Stats(self.profile, stream=f).sort_stats('cumulative').print_stats(self.top)
+            f.write(f"Peak traced memory: {peak / 1048576:.1f} MB\n\nTop allocations:\n")
+            for stat in snapshot.statistics('lineno')[:self.top]:
+                f.write(f"{stat}\n")
+        self.profile = None
+        print(f"🔬 Profile saved to {self.filename} (summary in {self.filename}.txt)")
+
+class BenchmarkSuite:
+    """Time every generator level and utility over parameterized input sizes.
+    
+    Each case reports candidates/sec, its own traced peak, the blocks it left
+    allocated and the peak RSS of a fresh interpreter that set up and ran only
+    that case; results are JSON so a run can be compared against a stored baseline.
+    """
+    # Hidden CLI flag that runs a single case in the child process measuring its RSS
+    CASE_FLAG = '--benchmark-rss-case'
+    SIZES = {
+        'small': {'keywords': 10, 'names': 10, 'count': 10000},
+        'medium': {'keywords': 100, 'names': 100, 'count': 100000},
+        'large': {'keywords': 1000, 'names': 1000, 'count': 1000000}
+    }
+    
+    def __init__(self, sizes: List[str] = None, repeat: int = 3):
+        self.sizes = sizes or ['small', 'medium']
+        self.repeat = repeat
+    
+    @staticmethod
+    def _inputs(size: Dict[str, int]) -> Tuple[List[str], List[str]]:
+        keywords = [f"keyword{i}" for i in range(size['keywords'])]
+        names = [f"name{i}" for i in range(size['names'])]
+        return keywords, names
+    
+    def cases(self, size: Dict[str, int], temp_dir: str, only: str = None) -> List[Tuple[str, Any]]:
+        """(name, callable returning a candidate count) pairs for one input size, or just case only"""
+        keywords, names = self._inputs(size)
+        count = size['count']
+        generator = PasswordListGenerator(seed=0)
+        patterns = ['{word}123', '{word}!', '2024{word}', '{word}@{word}', '_']
+        # The output utilities work on a prebuilt sample, which other cases should not be charged for
+        needs_sample = only is None or only in ('save_wordlist', 'analyze_wordlist')
+        sample = generator.generate_comprehensive_list(keywords, names, count) if needs_sample else None
+        sample_file = os.path.join(temp_dir, 'sample.txt')
+        
+        cases = [
+            ('generate_beginner_passwords', lambda: len(generator.generate_beginner_passwords(count))),
+            ('generate_intermediate_passwords',
+             lambda: len(generator.generate_intermediate_passwords(keywords, count))),
+            ('generate_advanced_passwords', lambda: len(generator.generate_advanced_passwords(keywords, count))),
+            ('generate_name_based_passwords',
+             lambda: len(generator.generate_name_based_passwords(names, count))),
+            ('generate_leet_speak', lambda: sum(len(generator.generate_leet_speak(word))
+                                                for word in keywords + names)),
+            ('generate_custom_pattern', lambda: len(generator.generate_custom_pattern(keywords + names, patterns))),
+            ('generate_comprehensive_list',
+             lambda: len(generator.generate_comprehensive_list(keywords, names, count))),
+            ('save_wordlist', lambda: PasswordUtils.save_wordlist(sample, sample_file)),
+            ('analyze_wordlist', lambda: PasswordUtils.analyze_wordlist(sample)['total_passwords'])
+        ]
+        return [case for case in cases if only is None or case[0] == only]
+    
+    @staticmethod
+    def _peak_rss_mb() -> float:
+        # Linux carries ru_maxrss across exec, so a child would report the parent's size it was forked at;
+        # VmHWM belongs to the current address space only
+        with contextlib.suppress(OSError):
+            with open('/proc/self/status', 'r', encoding='ascii') as f:
+                for line in f:
+                    if line.startswith('VmHWM:'):
+                        return round(int(line.split()[1]) / 1024, 2)
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is bytes on macOS and kilobytes elsewhere
+        return round(peak / (1048576 if sys.platform == 'darwin' else 1024), 2)
+    
+    @classmethod
+    def run_case(cls, key: str) -> Dict[str, Any]:
+        """Child side of case_peak_rss: set up and run one 'case[size]' once"""
+        case_name, _, size_name = key.rstrip(']').partition('[')
+        with tempfile.TemporaryDirectory(prefix='pwgen-bench-') as temp_dir:
+            for _, func in cls().cases(cls.SIZES[size_name], temp_dir, only=case_name):
+                with contextlib.redirect_stdout(io.StringIO()):
+                    func()
+        return {'peak_rss_mb': cls._peak_rss_mb()}
+    
+    def case_peak_rss(self, key: str) -> float:
+        """Peak RSS in MB of a fresh interpreter running one case, or None without resource"""
+        if resource is None:
+            return None
+        result = subprocess.run([sys.executable, os.path.abspath(__file__), '--no-banner', self.CASE_FLAG, key],
+                                capture_output=True, text=True, check=True)
+        return json.loads(result.stdout.splitlines()[-1])['peak_rss_mb']
+    
+    def measure(self, func) -> Dict[str, Any]:
+        """Best-of-N timing plus one traced run for the case's own peak and retained blocks"""
+        timings = []
+        candidates = 0
+        for _ in range(self.repeat):
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                candidates = func()
+            timings.append(time.perf_counter() - start)
+        
+        tracemalloc.start()
+        tracemalloc.reset_peak()
+        with contextlib.redirect_stdout(io.StringIO()):
+            func()
+        snapshot = tracemalloc.take_snapshot()
+        _, peak_traced = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        
+        best = min(timings)
+        return {
+            'candidates': candidates,
+            'seconds': round(best, 6),
+            'candidates_per_sec': round(candidates / best, 1) if best else 0.0,
+            'peak_traced_mb': round(peak_traced / 1048576, 3),
+            'retained_blocks': sum(stat.count for stat in snapshot.statistics('filename'))
+        }
+    
+    def run(self) -> Dict[str, Any]:
+        """Run every case at every configured size"""
+        results = {
+            'version': __version__,
+            'python': sys.version.split()[0],
+            'numpy': np is not None,
+            'generated_at': time.strftime('%Y-%m-%d %H:%M:%S'),
+            'results': {}
+        }
+        with tempfile.TemporaryDirectory(prefix='pwgen-bench-') as temp_dir:
+            for size_name in self.sizes:
+                size = self.SIZES[size_name]
+                for case_name, func in self.cases(size, temp_dir):
+                    key = f"{case_name}[{size_name}]"
+                    results['results'][key] = dict(self.measure(func), peak_rss_mb=self.case_peak_rss(key),
+                                                   size=size)
+                    result = results['results'][key]
+                    rss = '' if result['peak_rss_mb'] is None else f"  {result['peak_rss_mb']:>8.2f} MB RSS"
+                    print(f"⏱️  {key:<45} {result['candidates_per_sec']:>14,.0f} candidates/s  "
+                          f"{result['peak_traced_mb']:>8.2f} MB traced{rss}")
+        return results
+    
+    @staticmethod
+    def compare(results: Dict[str, Any], baseline: Dict[str, Any], tolerance: float = 0.2) -> List[str]:
+        """List the cases whose throughput fell more than tolerance below the baseline.
+        
+        Baseline cases missing from this run, or with no baseline throughput to
+        compare against, are listed too rather than passing silently.
+        """
+        regressions = []
+        for key, base in baseline.get('results', {}).items():
+            current = results['results'].get(key)
+            if current is None:
+                regressions.append(f"{key}: in the baseline but not measured in this run")
+                continue
+            if not base.get('candidates_per_sec'):
+                regressions.append(f"{key}: baseline has no throughput to compare against")
+                continue
+            ratio = current['candidates_per_sec'] / base['candidates_per_sec']
+            if ratio < 1 - tolerance:
+                regressions.append(f"{key}: {current['candidates_per_sec']:,.0f} candidates/s vs "
+                                   f"baseline {base['candidates_per_sec']:,.0f} ({ratio:.0%})")
+        return regressions
+
+_service_generator = None
+
+def _service_worker_init():
+    """Pool initializer: one generator per worker process, reused so its caches stay warm"""
+    global _service_generator
+    _service_generator = PasswordListGenerator(progress=logger.debug)
+    _service_generator.generate_keyboard_patterns()
+
+def _service_job(job: Dict[str, Any], channel, cancelled) -> int:
+    """Pool worker: stream one request's candidates into channel in batches.
+    
+    Messages are ('data', text), then ('done', count) or ('error', message).
+    channel is bounded, so a slow client holds the job back; the handler sets
+    cancelled when the client goes away, which stops the job at the next batch.
+    """
+    # A per-job copy shares the warm leet/keyboard caches but never the RNG
+    generator = copy.copy(_service_generator)
+    generator.seed = job.get('seed')
+    generator.rng = random.Random(generator.seed)
+    policy = job.get('policy')
+    count = job['count']
+    
+    written = 0
+    try:
+        if job['kind'] == 'pattern':
+            candidates = iter(generator.generate_custom_pattern(job['words'], job['patterns']))
+        elif job['level'] == 'all':
+            candidates = generator.iter_comprehensive_list(job['keywords'] or None, job['names'] or None,
+                                                           count, policy=policy)
+        else:
+            keywords = job['keywords'] or None
+            candidates = generator.iter_level(job['level'], keywords, job['names'])
+            if policy is not None:
+                candidates = policy.filter(candidates, job['level'])
+        candidates = itertools.islice(candidates, count)
+        
+        while not cancelled.is_set():
+            batch = list(itertools.islice(candidates, 4096))
+            if not batch:
+                break
+            channel.put(('data', '\n'.join(batch) + '\n'))
+            written += len(batch)
+    except Exception as e:
+        channel.put(('error', f"{type(e).__name__}: {e}"))
+        return written
+    channel.put(('done', written))
+    return written
+
+def _service_analyze(passwords: List[str]) -> Dict[str, Any]:
+    """Pool worker: analyze a posted wordlist"""
+    return PasswordUtils.analyze_wordlist(passwords)
+
+class ServiceMetrics:
+    """Thread-safe request latency and throughput counters for the service"""
+    
+    def __init__(self, window: int = 1000):
+        self.started = time.time()
+        self._lock = threading.Lock()
+        self._endpoints = {}
+        self._latencies = collections.deque(maxlen=window)
+    
+    def record(self, endpoint: str, seconds: float, candidates: int = 0, sent: int = 0, error: bool = False):
+        with self._lock:
+            stats = self._endpoints.setdefault(endpoint, Counter())
+            stats['requests'] += 1
+            stats['errors'] += int(error)
+            stats['candidates'] += candidates
+            stats['bytes'] += sent
+            stats['seconds'] += seconds
+            self._latencies.append(seconds)
+    
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            uptime = time.time() - self.started
+            latencies = sorted(self._latencies)
+            endpoints = {name: dict(stats, avg_latency=round(stats['seconds'] / stats['requests'], 4))
+                         for name, stats in self._endpoints.items()}
+        candidates = sum(stats['candidates'] for stats in endpoints.values())
+        
+        def percentile(fraction):
+            return round(latencies[min(len(latencies) - 1, int(len(latencies) * fraction))], 4) if latencies else 0
+        
+        return {
+            'uptime_seconds': round(uptime, 1),
+            'candidates_per_sec': round(candidates / uptime, 1) if uptime else 0.0,
+            'latency_p50': percentile(0.5),
+            'latency_p95': percentile(0.95),
+            'endpoints': endpoints
+        }
+
+class GenerationService:
+    """Localhost HTTP service exposing generation, custom patterns and analysis.
+    
+    GET  /generate?level=all&keywords=a,b&names=c&count=1000&seed=1&min_len=8&require=digit
+    GET  /pattern?words=a,b&patterns={word}123,{word}!
+    POST /analyze            (newline-separated wordlist body, at most max_body bytes)
+    GET  /metrics, /health
+    
+    Work runs on a bounded process pool whose workers keep their generator
+    caches warm between requests; generated candidates are streamed back with
+    chunked transfer encoding as the worker produces them.
+    """
+    
+    def __init__(self, host: str = '127.0.0.1', port: int = 8765, workers: int = 2,
+                 max_pending: int = None, max_count: int = 1000000, max_body: int = 64 * 1048576):
+        self.host = host
+        self.port = port
+        self.workers = max(1, workers)
+        self.max_pending = max_pending or self.workers * 4
+        self.max_count = max_count
+        self.max_body = max_body
+        self.metrics = ServiceMetrics()
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        self.pool = None
+        self.manager = None
+        self.server = None
+    
+    def serve_forever(self):
+        """Run until interrupted"""
+        self.manager = multiprocessing.Manager()
+        self.pool = concurrent.futures.ProcessPoolExecutor(self.workers, initializer=_service_worker_init)
+        self.server = http.server.ThreadingHTTPServer((self.host, self.port), self._handler_class())
+        print(f"🌐 Serving on http://{self.host}:{self.server.server_address[1]} with {self.workers} workers")
+        try:
+            self.server.serve_forever()
+        finally:
+            self.server.server_close()
+            self.pool.shutdown(cancel_futures=True)
+            self.manager.shutdown()
+    
+    def shutdown(self):
+        if self.server is not None:
+            self.server.shutdown()
+    
+    @staticmethod
+    def _words(query: Dict[str, List[str]], key: str) -> List[str]:
+        return [word for value in query.get(key, []) for word in value.split(',') if word]
+    
+    def parse_count(self, query: Dict[str, List[str]], default: int = 1000) -> int:
+        """Requested candidate count, which must lie in 1..max_count"""
+        value = query.get('count', [str(default)])[0]
+        try:
+            count = int(value)
+        except ValueError:
+            raise ValueError(f"count must be an integer, got {value!r}")
+        if not 1 <= count <= self.max_count:
+            raise ValueError(f"count must be between 1 and {self.max_count}")
+        return count
+    
+    @staticmethod
+    def parse_length(value: str) -> int:
+        """Request body length from a Content-Length header"""
+        try:
+            length = int(value or 0)
+        except ValueError:
+            raise ValueError(f"Content-Length must be an integer, got {value!r}")
+        if length < 0:
+            raise ValueError("Content-Length must not be negative")
+        return length
+    
+    def parse_pattern(self, query: Dict[str, List[str]]) -> Dict[str, Any]:
+        """Build a custom pattern job from query parameters"""
+        return {
+            'kind': 'pattern',
+            'words': self._words(query, 'words'),
+            'patterns': [p for value in query.get('patterns', []) for p in value.split(',')],
+            'count': self.parse_count(query, self.max_count)
+        }
+    
+    def parse_generate(self, query: Dict[str, List[str]]) -> Dict[str, Any]:
+        """Build a generation job from query parameters"""
+        def first(key, default=None):
+            return query.get(key, [default])[0]
+        
+        level = first('level', 'all')
+        if level not in ('all', 'beginner', 'intermediate', 'advanced', 'names'):
+            raise ValueError(f"Unknown level: {level}")
+        policy = None
+        if any(key in query for key in ('min_len', 'max_len', 'require')):
+            policy = PasswordPolicy(int(first('min_len', 0)),
+                                    int(first('max_len')) if 'max_len' in query else None,
+                                    self._words(query, 'require'))
+        return {
+            'kind': 'generate',
+            'level': level,
+            'keywords': self._words(query, 'keywords'),
+            'names': self._words(query, 'names'),
+            'count': self.parse_count(query),
+            'seed': int(first('seed')) if 'seed' in query else None,
+            'policy': policy
+        }
+    
+    def _handler_class(self):
+        service = self
+        
+        class Handler(http.server.BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            
+            def log_message(self, format, *args):
+                pass
+            
+            def _send_json(self, status: int, data: Dict[str, Any]) -> int:
+                body = json.dumps(data).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+                return len(body)
+            
+            def do_GET(self):
+                url = urllib.parse.urlparse(self.path)
+                query = urllib.parse.parse_qs(url.query, keep_blank_values=True)
+                if url.path == '/health':
+                    self._send_json(200, {'status': 'ok'})
+                elif url.path == '/metrics':
+                    self._send_json(200, service.metrics.snapshot())
+                elif url.path == '/generate':
+                    self._run(url.path, lambda: service.parse_generate(query))
+                elif url.path == '/pattern':
+                    self._run(url.path, lambda: service.parse_pattern(query))
+                else:
+                    self._send_json(404, {'error': f"Unknown endpoint {url.path}"})
+            
+            def do_POST(self):
+                url = urllib.parse.urlparse(self.path)
+                if url.path != '/analyze':
+                    self._send_json(404, {'error': f"Unknown endpoint {url.path}"})
+                    return
+                try:
+                    length = service.parse_length(self.headers.get('Content-Length'))
+                except ValueError as e:
+                    self.close_connection = True
+                    self._send_json(400, {'error': str(e)})
+                    return
+                if length > service.max_body:
+                    # The body is never read, so the connection cannot be reused
+                    self.close_connection = True
+                    self._send_json(413, {'error': f"Body exceeds {service.max_body} bytes"})
+                    return
+                start = time.perf_counter()
+                if not service._slots.acquire(blocking=False):
+                    self._send_json(503, {'error': 'Too many pending requests'})
+                    return
+                try:
+                    passwords = self.rfile.read(length).decode('utf-8').splitlines()
+                    analysis = service.pool.submit(_service_analyze, passwords).result()
+                    sent = self._send_json(200, analysis)
+                    service.metrics.record(url.path, time.perf_counter() - start, len(passwords), sent)
+                except Exception as e:
+                    service.metrics.record(url.path, time.perf_counter() - start, error=True)
+                    self._send_json(500, {'error': str(e)})
+                finally:
+                    service._slots.release()
+            
+            def _run(self, endpoint: str, build_job):
+                start = time.perf_counter()
+                try:
+                    job = build_job()
+                except ValueError as e:
+                    self._send_json(400, {'error': str(e)})
+                    return
+                if not service._slots.acquire(blocking=False):
+                    self._send_json(503, {'error': 'Too many pending requests'})
+                    return
+                channel = service.manager.Queue(maxsize=8)
+                cancelled = service.manager.Event()
+                sent = 0
+                try:
+                    future = service.pool.submit(_service_job, job, channel, cancelled)
+                    # Only commit to a 200 once the job has produced output or finished cleanly
+                    kind, payload = self._receive(channel, future)
+                    if kind == 'error':
+                        self._send_json(500, {'error': payload})
+                        service.metrics.record(endpoint, time.perf_counter() - start, error=True)
+                        return
+                    self.send_response(200)
+                    self.send_header('Content-Type', 'text/plain; charset=utf-8')
+                    self.send_header('Transfer-Encoding', 'chunked')
+                    self.end_headers()
+                    while kind == 'data':
+                        data = payload.encode('utf-8')
+                        self.wfile.write(b'%x\r\n%s\r\n' % (len(data), data))
+                        sent += len(data)
+                        kind, payload = self._receive(channel, future)
+                    if kind == 'error':
+                        # Headers are out: leave the chunked body unterminated so the client sees the failure
+                        self.close_connection = True
+                        service.metrics.record(endpoint, time.perf_counter() - start, sent=sent, error=True)
+                        return
+                    self.wfile.write(b'0\r\n\r\n')
+                    service.metrics.record(endpoint, time.perf_counter() - start, payload, sent)
+                except (BrokenPipeError, ConnectionResetError):
+                    cancelled.set()
+                    self.close_connection = True
+                    service.metrics.record(endpoint, time.perf_counter() - start, sent=sent, error=True)
+                    # Drain so a job blocked on the full channel can see the cancellation and finish
+                    while self._receive(channel, future)[0] == 'data':
+                        pass
+                finally:
+                    service._slots.release()
+            
+            @staticmethod
+            def _receive(channel, future) -> Tuple[str, Any]:
+                """Next message from a job; a job that died without reporting becomes an error"""
+                while True:
+                    try:
+                        return channel.get(timeout=0.5)
+                    except queue.Empty:
+                        if future.done():
+                            error = future.exception()
+                            return 'error', f"{type(error).__name__}: {error}" if error else 'Job ended early'
+        
+        return Handler
 
 def basic_example():
     """Basic example usage"""
@@ -469,7 +3743,9 @@ def advanced_example():
     beginner = generator.generate_beginner_passwords(50)
     advanced = generator.generate_advanced_passwords(['Hamdan', '11'], 100)
     
-    all_passwords = list(dict.fromkeys(beginner + advanced + custom_passwords))
+    dedup = Deduplicator.create('exact')
+    all_passwords = list(dedup.filter(beginner + advanced + custom_passwords))
+    print(dedup.report())
     
     utils.save_wordlist(all_passwords, 'custom_wordlist.txt')
     utils.save_wordlist(all_passwords, 'custom_wordlist.json', 'json')
@@ -488,21 +3764,136 @@ def cli_interface():
                        help='Output filename')
     parser.add_argument('-c', '--count', type=int, default=1000,
                        help='Total number of passwords to generate')
-    parser.add_argument('--format', choices=['txt', 'json'], default='txt',
-                       help='Output format')
+    parser.add_argument('--format', choices=['txt', 'json', 'jsonl'], default='txt',
+                       help='Output format (.gz/.bz2/.xz/.zst output is compressed by extension)')
+    parser.add_argument('--background-writer', action='store_true',
+                       help='Write output on a background thread so generation and disk I/O overlap')
+    parser.add_argument('--atomic', action='store_true',
+                       help='Write to a temporary file and rename it into place on completion')
     
     parser.add_argument('--keywords', nargs='+', help='Keywords for password generation')
     parser.add_argument('--names', nargs='+', help='Names for password generation')
     parser.add_argument('--level', choices=['beginner', 'intermediate', 'advanced', 'all'],
                        default='all', help='Password complexity level')
     
-    parser.add_argument('--keywords-file', help='File containing keywords')
-    parser.add_argument('--names-file', help='File containing names')
+    parser.add_argument('--keywords-file', nargs='+', help='Files containing keywords (plain or compressed)')
+    parser.add_argument('--names-file', nargs='+', help='Files containing names (plain or compressed)')
+    parser.add_argument('--lowercase-input', action='store_true',
+                       help='Casefold keywords and names while loading them')
+    
+    parser.add_argument('--rules', help='Hashcat-style rule file applied to keywords and names')
+    parser.add_argument('--rule', nargs='+', help='Inline hashcat-style rules')
+    
+    parser.add_argument('--mask', help='Enumerate a mask keyspace, e.g. ?u?l?l?l?d?d?s')
+    for n in range(1, 5):
+        parser.add_argument(f'--custom-charset{n}', help=f'Custom charset referenced as ?{n} in masks')
+    parser.add_argument('--skip', type=int, default=0, help='Mask keyspace position to start from')
+    parser.add_argument('--limit', type=int, help='Number of mask candidates to emit (default: rest of keyspace)')
+    
+    parser.add_argument('--analyze', metavar='FILE', help='Analyze an existing wordlist file and exit')
+    
+    parser.add_argument('--checkpoint', action='store_true',
+                       help='Write periodic checkpoints so an interrupted run can be resumed')
+    parser.add_argument('--checkpoint-file', help='Checkpoint path (default: <output>.ckpt)')
+    parser.add_argument('--checkpoint-interval', type=float, default=5.0,
+                       help='Seconds between checkpoints')
+    parser.add_argument('--resume', action='store_true',
+                       help='Continue an interrupted run from its checkpoint, appending to the output')
+    
+    parser.add_argument('--benchmark', action='store_true', help='Run the benchmark suite and exit')
+    parser.add_argument(BenchmarkSuite.CASE_FLAG, help=argparse.SUPPRESS)
+    parser.add_argument('--benchmark-sizes', nargs='+', choices=list(BenchmarkSuite.SIZES),
+                       default=['small', 'medium'], help='Input sizes to benchmark')
+    parser.add_argument('--benchmark-output', help='Write benchmark results as JSON to this file')
+    parser.add_argument('--benchmark-baseline', help='Fail if throughput regresses against this JSON baseline')
+    parser.add_argument('--benchmark-tolerance', type=float, default=0.2,
+                       help='Allowed fractional throughput drop against the baseline')
+    
+    parser.add_argument('--train-markov', metavar='CORPUS',
+                       help='Train a Markov model on a wordlist and save it to --markov-model')
+    parser.add_argument('--markov-model', help='Markov model file to write when training')
+    parser.add_argument('--markov', metavar='MODEL',
+                       help='Generate candidates from a trained Markov model, most likely first')
+    parser.add_argument('--markov-max-length', type=int, default=16,
+                       help='Longest password the Markov model covers')
+    
+    parser.add_argument('--no-cache', action='store_true', help='Bypass the on-disk segment cache')
+    parser.add_argument('--cache-dir', help='Segment cache directory (default: ~/.cache/password-generator)')
+    parser.add_argument('--cache-size', type=int, default=1024, help='Segment cache size limit in MB')
+    
+    parser.add_argument('--combine', nargs='+', metavar='SPEC',
+                       help='Cross-product of components in order: words, names, file:PATH, '
+                            'years:1990-2024, dates:2024-01-01..2024-12-31[:%%d%%m%%Y], list:,_,@')
+    parser.add_argument('--combo-cap', type=int, help='Use at most N entries from each combinator component')
+    parser.add_argument('--random', action='store_true',
+                       help='Generate COUNT seeded random candidates (reproducible with --seed)')
+    parser.add_argument('--random-charset', default=RandomStream.DEFAULT_CHARSET,
+                       help='Characters for --random candidates')
+    parser.add_argument('--random-length', type=int, nargs=2, default=[8, 12], metavar=('MIN', 'MAX'),
+                       help='Length range for --random candidates')
+    
+    parser.add_argument('--wordlist-op', choices=WordlistAlgebra.OPERATIONS,
+                       help='Combine --inputs wordlists (subtract removes later inputs from the first; '
+                            'top keeps the COUNT most frequent words)')
+    parser.add_argument('--inputs', nargs='+', metavar='FILE',
+                       help='Wordlists (plain or compressed txt/json/jsonl) for --wordlist-op')
+    
+    parser.add_argument('--audit', metavar='HASHES',
+                       help='Check generated candidates against a hash dump (one hash or label:hash per line) '
+                            'and report only matches; nothing else is written')
+    parser.add_argument('--hash', choices=sorted(HashAuditor.DIGEST_SIZES), default='ntlm',
+                       help='Hash algorithm of the --audit dump')
+    parser.add_argument('--salt', default='', help='Salt substituted into --salt-format')
+    parser.add_argument('--salt-format', default='{password}',
+                       help="How salt and password are combined before hashing, e.g. '{salt}{password}'")
+    parser.add_argument('--audit-index', help='Index file for the dump (default: HASHES.<hash>.idx)')
+    parser.add_argument('--audit-output', help='Also write matches as hash:password lines to this file')
+    
+    parser.add_argument('--keyboard-layout', choices=sorted(KeyboardWalker.LAYOUTS), default='qwerty',
+                       help='Keyboard layout for walk patterns')
+    parser.add_argument('--walks', type=int, nargs=2, metavar=('MIN', 'MAX'),
+                       help='Generate keyboard walks of MIN to MAX keys')
+    parser.add_argument('--walk-turns', type=int, default=1,
+                       help='Maximum direction changes in a keyboard walk')
+    parser.add_argument('--walk-start', help='Only start walks on these keys')
+    
+    parser.add_argument('--min-len', type=int, default=0, help='Policy: minimum candidate length')
+    parser.add_argument('--max-len', type=int, help='Policy: maximum candidate length')
+    parser.add_argument('--require', help='Policy: required classes, e.g. upper,digit,special')
+    parser.add_argument('--allow', metavar='REGEX', help='Policy: candidates must match this regex')
+    parser.add_argument('--deny', metavar='REGEX', help='Policy: candidates must not match this regex')
+    
+    parser.add_argument('--progress', action='store_true',
+                       help='Show a live progress line with ETA on stderr and per-stage stats')
+    parser.add_argument('--profile', metavar='FILE',
+                       help='Write cProfile stats to FILE and a text summary with tracemalloc to FILE.txt')
+    
+    parser.add_argument('--serve', action='store_true', help='Run the local HTTP generation service')
+    parser.add_argument('--host', default='127.0.0.1', help='Service bind address')
+    parser.add_argument('--port', type=int, default=8765, help='Service port')
+    parser.add_argument('--serve-max-count', type=int, default=1000000,
+                       help='Largest count a single service request may ask for')
+    parser.add_argument('--serve-max-body', type=int, default=64,
+                       help='Largest /analyze request body in MB')
     
     parser.add_argument('--example', action='store_true', help='Run basic example')
     parser.add_argument('--advanced-example', action='store_true', help='Run advanced example')
     
     parser.add_argument('--no-banner', action='store_true', help='Hide banners')
+    parser.add_argument('--stream', action='store_true',
+                       help='Generate lazily and write incrementally instead of building the list in memory')
+    parser.add_argument('--dedup', choices=['exact', 'bloom', 'external'], default='exact',
+                       help='Deduplication engine: exact fingerprints, Bloom filter, or external sort on disk '
+                            '(sorted output, --rules/--combine only)')
+    parser.add_argument('--dedup-fp-rate', type=float, default=0.001,
+                       help='False-positive rate for the bloom dedup engine')
+    parser.add_argument('--dedup-capacity', type=int,
+                       help='Expected number of candidates; sizes bloom filters and hints the exact table (default: --count)')
+    parser.add_argument('--workers', type=int, default=1,
+                       help='Split generation into deterministic shards across N processes')
+    parser.add_argument('--seed', type=int, help='Random seed for reproducible output')
+    parser.add_argument('--dedup-chunk', type=int, default=1000000,
+                       help='Candidates held in memory per sorted run for the external dedup engine')
     
     args = parser.parse_args()
     
@@ -513,6 +3904,9 @@ def cli_interface():
         Banner.show_main_banner()
         Banner.show_legal_warning()
     
+    if args.profile:
+        RunProfiler(args.profile).start()
+    
     if args.example:
         basic_example()
         return
@@ -521,48 +3915,287 @@ def cli_interface():
         advanced_example()
         return
     
-    # Load data from files if provided
+    if args.serve:
+        GenerationService(args.host, args.port, args.workers, max_count=args.serve_max_count,
+                          max_body=args.serve_max_body * 1048576).serve_forever()
+        return
+    
+    if args.benchmark_rss_case:
+        print(json.dumps(BenchmarkSuite.run_case(args.benchmark_rss_case)))
+        return
+    
+    if args.benchmark:
+        results = BenchmarkSuite(args.benchmark_sizes).run()
+        if args.benchmark_output:
+            with open(args.benchmark_output, 'w', encoding='utf-8') as f:
+                json.dump(results, f, indent=2)
+            print(f"💾 Benchmark results saved to {args.benchmark_output}")
+        else:
+            print(json.dumps(results, indent=2))
+        if args.benchmark_baseline:
+            with open(args.benchmark_baseline, 'r', encoding='utf-8') as f:
+                baseline = json.load(f)
+            regressions = BenchmarkSuite.compare(results, baseline, args.benchmark_tolerance)
+            if regressions:
+                print("❌ Regressions or unmatched cases against baseline:")
+                for regression in regressions:
+                    print(f"   {regression}")
+                sys.exit(1)
+            print("✅ No regressions against baseline")
+        return
+    
+    if args.train_markov:
+        if not args.markov_model:
+            raise ValueError("--train-markov needs --markov-model to save the model to")
+        model = MarkovModel.train(PasswordUtils.iter_wordlist(args.train_markov), args.markov_max_length)
+        model.save(args.markov_model)
+        print(f"🧠 Trained Markov model on {args.train_markov} "
+              f"({len(model.alphabet)} symbols) -> {args.markov_model}")
+        return
+    
+    if args.analyze:
+        analysis = PasswordUtils.analyze_file(args.analyze)
+        print(f"📊 {args.analyze}: {analysis['total_passwords']} passwords, "
+              f"length {analysis['min_length']}-{analysis['max_length']} (avg {analysis['avg_length']}), "
+              f"entropy {analysis['entropy_stats']['min']}-{analysis['entropy_stats']['max']} "
+              f"(avg {analysis['entropy_stats']['avg']})")
+        print("📏 Length histogram:")
+        for length, count in analysis['length_histogram'].items():
+            print(f"   {length:>4}: {count}")
+        print("🔐 Entropy histogram:")
+        for bucket, count in analysis['entropy_histogram'].items():
+            print(f"   {bucket:>4}-{bucket + WordlistAnalyzer.ENTROPY_BUCKET - 1:<4}: {count}")
+        return
+    
+    if args.wordlist_op:
+        if not args.inputs:
+            raise ValueError("--wordlist-op needs --inputs")
+        algebra = WordlistAlgebra(args.dedup_chunk)
+        print(f"🧮 {args.wordlist_op} of {len(args.inputs)} wordlists...")
+        PasswordUtils.save_wordlist(algebra.iter_result(args.wordlist_op, args.inputs, args.count),
+                                    args.output, args.format, background=args.background_writer,
+                                    atomic=args.atomic)
+        print(algebra.report())
+        return
+    
+    # Stream data from files if provided
     keywords = args.keywords or []
     names = args.names or []
     
     if args.keywords_file:
-        keywords.extend(PasswordUtils.load_keywords(args.keywords_file))
+        keywords = WordSource(args.keywords_file, extra=keywords, lowercase=args.lowercase_input)
     
     if args.names_file:
-        names.extend(PasswordUtils.load_names(args.names_file))
+        names = WordSource(args.names_file, extra=names, lowercase=args.lowercase_input)
     
     # Initialize generator
-    generator = PasswordListGenerator()
+    generator = PasswordListGenerator(seed=args.seed)
+    generator.keyboard = KeyboardWalker(args.keyboard_layout)
+    generator.max_walk_turns = args.walk_turns
+    if not args.no_cache:
+        generator.cache = SegmentCache(args.cache_dir, args.cache_size * 1048576)
     utils = PasswordUtils()
     
     wordlist_name = os.path.splitext(args.output)[0]
+    dedup = Deduplicator.create(args.dedup, capacity=args.dedup_capacity or args.count,
+                                fp_rate=args.dedup_fp_rate, chunk_size=args.dedup_chunk)
+    if not dedup.ordered:
+        # Sorted output would reorder prioritized levels, and --count could not stop the stream early
+        if not (args.rules or args.rule or args.combine) or args.mask or args.markov or args.random \
+                or args.walks or args.audit:
+            raise ValueError("--dedup external emits sorted output after reading every candidate; "
+                             "use it only with --rules/--rule or --combine")
+        print(f"⚠️  External dedup reads every candidate before writing; --count keeps the first "
+              f"{args.count:,} in sorted order")
     
     if not args.no_banner:
         Banner.show_generation_banner(wordlist_name, args.count)
         Banner.show_level_banner(args.level)
     
-    # Generate based on level
-    if args.level == 'all':
-        passwords = generator.generate_comprehensive_list(
+    policy = None
+    if args.min_len or args.max_len is not None or args.require or args.allow or args.deny:
+        policy = PasswordPolicy(args.min_len, args.max_len,
+                                args.require.split(',') if args.require else (), args.allow, args.deny)
+    
+    checkpointing = args.checkpoint or args.resume
+    if checkpointing:
+        if args.level != 'all' or args.mask or args.rules or args.rule or args.workers > 1 or args.audit:
+            raise ValueError("Checkpoints are supported for --level all without --mask, --rules, --workers "
+                             "or --audit")
+        if args.dedup == 'external' or args.format not in GenerationCheckpoint.RESUMABLE_FORMATS \
+                or PasswordUtils.compression_for(args.output) or args.atomic:
+            raise ValueError("Checkpoints need uncompressed, non-atomic txt/jsonl output and exact or bloom dedup")
+    
+    # Generate based on level; each source counts what it generates before any filter
+    stats = RunStats(args.count, policy=policy)
+    rules = None
+    target = args.count
+    # Only modes that pass candidates through dedup report on it
+    deduplicating = False
+    if checkpointing:
+        # Consumed by GenerationCheckpoint.run below
+        passwords = None
+        deduplicating = True
+    elif args.markov:
+        model = MarkovModel.load(args.markov)
+        print(f"🧠 Generating from Markov model {args.markov} in probability order...")
+        max_length = args.markov_max_length if policy is None or policy.max_length is None \
+            else min(args.markov_max_length, policy.max_length)
+        passwords = stats.counted('generated', model.iter_candidates(min_length=max(1, args.min_len),
+                                                                     max_length=max_length))
+        if policy is not None:
+            passwords = policy.filter(passwords, 'markov')
+        passwords = itertools.islice(passwords, args.count)
+    elif args.mask:
+        custom_charsets = {str(n): getattr(args, f'custom_charset{n}') for n in range(1, 5)
+                           if getattr(args, f'custom_charset{n}')}
+        mask = MaskGenerator(args.mask, custom_charsets)
+        print(f"🎭 Mask {args.mask}: keyspace {mask.keyspace:,}")
+        passwords = stats.counted('generated', mask.iter_candidates(args.skip, args.limit, policy))
+        target = mask.keyspace - args.skip
+        if args.limit:
+            target = min(args.limit, target)
+        # Mask keyspaces are unique by construction and usually too large to hold in memory
+        args.stream = True
+    elif args.combine:
+        components = [Combinator.parse_component(spec, keywords, names) for spec in args.combine]
+        combinator = Combinator(components, args.combo_cap, policy)
+        bound = '' if combinator.size_is_exact else '≤ '
+        print(f"🔗 Combining {len(components)} components: {bound}{combinator.total_size():,} candidates")
+        passwords = itertools.islice(dedup.filter(stats.counted('generated', combinator.iter_candidates())),
+                                     args.count)
+        deduplicating = True
+        args.stream = True
+    elif args.random:
+        if args.seed is None:
+            args.seed = random.SystemRandom().getrandbits(63)
+        print(f"🎲 Generating {args.count:,} random candidates with seed {args.seed} "
+              f"(pass --seed {args.seed} to reproduce)")
+        passwords = RandomStream.generate(args.seed, args.count, args.workers, policy=policy,
+                                          charset=args.random_charset, min_length=args.random_length[0],
+                                          max_length=args.random_length[1], stats=stats)
+        args.stream = True
+    elif args.walks:
+        print(f"⌨️  Walking the {args.keyboard_layout} keyboard, {args.walks[0]}-{args.walks[1]} keys, "
+              f"up to {args.walk_turns} turns...")
+        passwords = stats.counted('generated', generator.keyboard.iter_walks(args.walks[0], args.walks[1],
+                                                                             args.walk_turns, args.walk_start))
+        if policy is not None:
+            passwords = policy.filter(passwords, 'walks')
+        passwords = itertools.islice(passwords, args.count)
+    elif args.rules or args.rule:
+        rules = RuleEngine.load(args.rules) if args.rules else RuleEngine()
+        for rule in args.rule or []:
+            rules.add_rule(rule)
+        passwords = stats.counted('generated', generator.iter_rule_based(itertools.chain(keywords, names), rules))
+        if policy is not None:
+            passwords = policy.filter(passwords, 'rules')
+        passwords = itertools.islice(dedup.filter(passwords), args.count)
+        deduplicating = True
+    elif args.workers > 1:
+        sharded = ShardedGenerator(args.workers, seed=args.seed or 0, dedup=dedup, policy=policy,
+                                   keyboard_layout=args.keyboard_layout, max_walk_turns=args.walk_turns,
+                                   stats=stats)
+        passwords = sharded.iter_candidates(args.level, keywords, names, args.count)
+        deduplicating = True
+    elif args.level == 'all':
+        passwords = generator.iter_comprehensive_list(
             keywords=keywords if keywords else None,
             names=names if names else None,
-            total_count=args.count
+            total_count=args.count,
+            dedup=dedup,
+            policy=policy,
+            stats=stats
         )
-    elif args.level == 'beginner':
-        passwords = generator.generate_beginner_passwords(args.count)
-    elif args.level == 'intermediate':
-        passwords = generator.generate_intermediate_passwords(keywords, args.count)
-    elif args.level == 'advanced':
-        passwords = generator.generate_advanced_passwords(keywords, args.count)
+        deduplicating = True
+    else:
+        passwords = stats.counted('generated', generator.iter_level_cached(args.level, keywords, None, args.count))
+        if policy is not None:
+            passwords = policy.filter(passwords, args.level)
+    
+    stats.target = target
+    stats.dedup = dedup if deduplicating else None
+    if args.progress:
+        stats.start()
+    
+    if args.audit:
+        index = HashIndex.load(args.audit, args.hash, args.audit_index)
+        if not len(index):
+            raise ValueError(f"No {args.hash} hashes found in {args.audit}")
+        auditor = HashAuditor(index, args.salt, args.salt_format, args.workers)
+        print(f"🔎 Auditing against {len(index):,} {args.hash} hashes from {args.audit}...")
+        with open(args.audit_output, 'w', encoding='utf-8') if args.audit_output \
+                else contextlib.nullcontext() as found:
+            try:
+                with stats.phase('audit'):
+                    # Generation runs inside the audit phase, so it is timed as it is pulled
+                    candidates = stats.counted('written', stats.timed('generate', passwords))
+                    for digest, password in auditor.audit(candidates):
+                        print(f"🔓 {digest}:{password}")
+                        if found is not None:
+                            found.write(f"{digest}:{password}\n")
+            finally:
+                stats.stop()
+        print(auditor.report())
+        if policy is not None:
+            print(policy.report())
+        if args.progress:
+            print(stats.report())
+        return
     
     # Save output
-    utils.save_wordlist(passwords, args.output, args.format)
+    if checkpointing:
+        checkpoint = GenerationCheckpoint(args.checkpoint_file or f"{args.output}.ckpt",
+                                          args.checkpoint_interval)
+        options = {'seed': args.seed, 'dedup': args.dedup, 'dedup_fp_rate': args.dedup_fp_rate,
+                   'dedup_capacity': args.dedup_capacity, 'min_len': args.min_len, 'max_len': args.max_len,
+                   'require': args.require, 'allow': args.allow, 'deny': args.deny}
+        try:
+            with stats.phase('write'):
+                total = checkpoint.run(generator, dedup, keywords or None, names or None, args.count,
+                                       args.output, args.format, resume=args.resume, options=options,
+                                       background=args.background_writer, policy=policy, stats=stats)
+        finally:
+            stats.stop()
+        args.stream = True
+    else:
+        if args.stream:
+            # Streamed generation runs inside the write phase, so it is timed as it is pulled
+            passwords = stats.timed('generate', passwords)
+        passwords = stats.counted('written', passwords)
+        try:
+            if not args.stream:
+                with stats.phase('generate'):
+                    passwords = WordBatch.from_words(passwords)
+            with stats.phase('write'):
+                total = utils.save_wordlist(passwords, args.output, args.format,
+                                            background=args.background_writer, atomic=args.atomic)
+        finally:
+            stats.stop()
+    if rules:
+        print(rules.report())
+    if policy is not None:
+        print(policy.report())
+    for source in (keywords, names):
+        if isinstance(source, WordSource):
+            for line in source.report():
+                print(line)
+    if deduplicating:
+        print(dedup.report())
     
-    # Show analysis
-    analysis = utils.analyze_wordlist(passwords)
+    # Show analysis; streamed runs are analyzed by reading the output back
+    with stats.phase('analyze'):
+        if args.stream and args.format == 'txt':
+            analysis = utils.analyze_file(args.output)
+        elif args.stream:
+            analysis = utils.analyze_wordlist(utils.iter_wordlist(args.output, args.format))
+        else:
+            analysis = utils.analyze_wordlist(passwords)
+    if args.progress:
+        print(stats.report())
     
     if not args.no_banner:
-        Banner.show_completion_banner(args.output, len(passwords), analysis)
+        Banner.show_completion_banner(args.output, total, analysis)
     else:
         print(f"✓ Generated {analysis['total_passwords']} passwords")
         print(f"✓ Saved to {args.output}")
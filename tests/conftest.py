@@ -0,0 +1,30 @@
+import importlib.util
+import pathlib
+import sys
+
+import pytest
+
+MODULE_PATH = pathlib.Path(__file__).resolve().parent.parent / 'Password-Generator.py'
+
+
+def _load_module():
+    # The script's file name has a hyphen, so it cannot be imported by name
+    if 'password_generator' not in sys.modules:
+        spec = importlib.util.spec_from_file_location('password_generator', MODULE_PATH)
+        module = importlib.util.module_from_spec(spec)
+        # Registered before executing so pool workers can unpickle its functions
+        sys.modules['password_generator'] = module
+        spec.loader.exec_module(module)
+    return sys.modules['password_generator']
+
+
+@pytest.fixture(scope='session')
+def pg():
+    return _load_module()
+
+
+@pytest.fixture
+def quiet_generator(pg):
+    def build(seed=0):
+        return pg.PasswordListGenerator(seed=seed, progress=lambda message: None)
+    return build
@@ -0,0 +1,56 @@
+import random
+import statistics
+
+import pytest
+
+WORDS = ['password', 'Passw0rd!', 'abc', '12345678', 'Ünïcødé1', 'a', 'Summer2024', '!@#$%^&*', ''] * 7
+
+
+def reference(pg, words):
+    entropies = [pg.PasswordUtils.calculate_entropy(word) for word in words]
+    return {
+        'total_passwords': len(words),
+        'avg_length': round(statistics.mean(map(len, words)), 2),
+        'min_length': min(map(len, words)),
+        'max_length': max(map(len, words)),
+        'entropy_stats': {'min': min(entropies), 'max': max(entropies),
+                          'avg': round(statistics.mean(entropies), 2)}
+    }
+
+
+def summary(analysis):
+    return {key: value for key, value in analysis.items() if not key.endswith('histogram')}
+
+
+@pytest.fixture(params=['numpy', 'pure'])
+def analyzer_backend(request, pg, monkeypatch):
+    if request.param == 'pure':
+        monkeypatch.setattr(pg, 'np', None)
+    elif pg.np is None:
+        pytest.skip('numpy is not installed')
+    return request.param
+
+
+def test_wordlist_statistics_match_per_password_reference(pg, analyzer_backend):
+    analysis = pg.PasswordUtils.analyze_wordlist(iter(WORDS), chunk_size=10)
+    assert summary(analysis) == reference(pg, WORDS)
+    assert sum(analysis['length_histogram'].values()) == len(WORDS)
+    assert sum(analysis['entropy_histogram'].values()) == len(WORDS)
+
+
+def test_batch_and_file_paths_agree_with_lists(pg, analyzer_backend, tmp_path):
+    rng = random.Random(5)
+    words = [''.join(rng.choice('aZ9!é') for _ in range(rng.randint(1, 12))) for _ in range(3000)]
+    expected = pg.PasswordUtils.analyze_wordlist(words)
+
+    assert pg.PasswordUtils.analyze_wordlist(pg.WordBatch.from_words(words)) == expected
+    path = tmp_path / 'words.txt'
+    path.write_text('\n'.join(words), encoding='utf-8')
+    # Small blocks split words across reads, and the last line has no newline
+    assert pg.PasswordUtils.analyze_file(str(path), block_size=97) == expected
+
+
+def test_empty_input(pg):
+    analysis = pg.PasswordUtils.analyze_wordlist([])
+    assert analysis['total_passwords'] == 0
+    assert analysis['length_histogram'] == {}
@@ -0,0 +1,14 @@
+import asyncio
+
+
+def test_stream_matches_comprehensive_list(quiet_generator):
+    generator = quiet_generator(seed=9)
+    messages = []
+
+    async def collect():
+        return [password async for batch in generator.stream('all', ['corp'], ['alice'], 4000, batch_size=300,
+                                                           progress=messages.append)
+                for password in batch]
+
+    assert asyncio.run(collect()) == quiet_generator(seed=9).generate_comprehensive_list(['corp'], ['alice'], 4000)
+    assert messages
@@ -0,0 +1,20 @@
+def test_compare_reports_regressions_and_unmatched_cases(pg):
+    baseline = {'results': {
+        'fast[small]': {'candidates_per_sec': 1000.0},
+        'zero[small]': {'candidates_per_sec': 0.0},
+        'gone[small]': {'candidates_per_sec': 10.0},
+        'steady[small]': {'candidates_per_sec': 100.0},
+    }}
+    results = {'results': {
+        'fast[small]': {'candidates_per_sec': 500.0},
+        'zero[small]': {'candidates_per_sec': 5.0},
+        'steady[small]': {'candidates_per_sec': 95.0},
+    }}
+    regressions = pg.BenchmarkSuite.compare(results, baseline, tolerance=0.2)
+    assert [line.split(':')[0] for line in regressions] == ['fast[small]', 'zero[small]', 'gone[small]']
+
+
+def test_single_case_runs_alone(pg):
+    suite = pg.BenchmarkSuite()
+    result = suite.run_case('generate_beginner_passwords[small]')
+    assert result['peak_rss_mb'] > 0
@@ -0,0 +1,51 @@
+import itertools
+
+import pytest
+
+
+class InterruptAfter:
+    """Stands in for RunStats and raises KeyboardInterrupt after count candidates"""
+
+    def __init__(self, count):
+        self.count = count
+
+    def counted(self, stage, candidates):
+        if stage != 'written':
+            yield from candidates
+            return
+        for password in itertools.islice(candidates, self.count):
+            yield password
+        raise KeyboardInterrupt
+
+
+def run(pg, quiet_generator, tmp_path, output, resume=False, stats=None):
+    checkpoint = pg.GenerationCheckpoint(str(tmp_path / 'run.ckpt'), interval=0)
+    return checkpoint.run(quiet_generator(seed=42), pg.Deduplicator.create('exact'), ['admin', 'corp'],
+                          ['alice'], 20000, str(output), resume=resume, stats=stats)
+
+
+def test_resumed_run_matches_uninterrupted_run(pg, quiet_generator, tmp_path, capsys):
+    reference = tmp_path / 'reference.txt'
+    run(pg, quiet_generator, tmp_path, reference)
+
+    output = tmp_path / 'resumed.txt'
+    with pytest.raises(KeyboardInterrupt):
+        run(pg, quiet_generator, tmp_path, output, stats=InterruptAfter(7000))
+    assert (tmp_path / 'run.ckpt').exists()
+    # A torn final line must be dropped on resume
+    with open(output, 'a', encoding='utf-8') as f:
+        f.write('partial-li')
+    run(pg, quiet_generator, tmp_path, output, resume=True)
+
+    assert output.read_text() == reference.read_text()
+    assert not (tmp_path / 'run.ckpt').exists()
+
+
+def test_checkpoint_rejects_changed_options(pg, quiet_generator, tmp_path, capsys):
+    output = tmp_path / 'out.txt'
+    with pytest.raises(KeyboardInterrupt):
+        run(pg, quiet_generator, tmp_path, output, stats=InterruptAfter(100))
+    checkpoint = pg.GenerationCheckpoint(str(tmp_path / 'run.ckpt'))
+    with pytest.raises(ValueError):
+        checkpoint.run(quiet_generator(seed=42), pg.Deduplicator.create('exact'), ['other'], ['alice'],
+                       20000, str(output), resume=True)
@@ -0,0 +1,9 @@
+def test_combinator_size_matches_enumeration(pg):
+    components = [['admin', 'Root', 'x'], ['', '_', '@'], ['1990', '24', '']]
+    for policy in [None, pg.PasswordPolicy(6, 10), pg.PasswordPolicy(0, None, ['upper', 'digit'])]:
+        combinator = pg.Combinator(components, policy=policy)
+        assert combinator.size_is_exact
+        assert combinator.total_size() == len(list(combinator.iter_candidates()))
+    bounded = pg.Combinator(components, policy=pg.PasswordPolicy(deny='@'))
+    assert not bounded.size_is_exact
+    assert bounded.total_size() >= len(list(bounded.iter_candidates()))
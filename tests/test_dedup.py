@@ -0,0 +1,29 @@
+import pytest
+
+
+WORDS = [f"word{i % 700}" for i in range(3000)]
+
+
+@pytest.mark.parametrize('mode', ['exact', 'bloom', 'external'])
+def test_dedup_engines_keep_first_occurrences(pg, tmp_path, mode):
+    # A tiny exact table has to grow; a Bloom filter must be sized for its input
+    capacity = 10000 if mode == 'bloom' else 16
+    dedup = pg.Deduplicator.create(mode, capacity, fp_rate=1e-9, chunk_size=100, temp_dir=str(tmp_path))
+    result = list(dedup.filter(WORDS))
+    if mode == 'external':
+        # External sort emits distinct words in sorted order
+        assert result == sorted(set(WORDS))
+    else:
+        assert result == list(dict.fromkeys(WORDS))
+    assert (dedup.unique, dedup.duplicates) == (700, 2300)
+
+
+def test_dedup_rejects_bad_fp_rate(pg):
+    with pytest.raises(ValueError):
+        pg.Deduplicator.create('bloom', fp_rate=1.5)
+
+
+def test_external_add_answers_word_by_word(pg, tmp_path):
+    dedup = pg.Deduplicator.create('external', temp_dir=str(tmp_path))
+    assert not dedup.ordered
+    assert [dedup.add(word) for word in ['b', 'a', 'b']] == [True, True, False]
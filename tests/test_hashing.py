@@ -0,0 +1,53 @@
+import hashlib
+
+import pytest
+
+# RFC 1320 appendix A.5
+MD4_VECTORS = [
+    (b'', '31d6cfe0d16ae931b73c59d7e0c089c0'),
+    (b'a', 'bde52cb31de33e46245e05fbdbd6fb24'),
+    (b'abc', 'a448017aaf21d8525fc10ae87aa6729d'),
+    (b'message digest', 'd9130a8164549fe818874806e1c7014b'),
+    (b'abcdefghijklmnopqrstuvwxyz', 'd79e1c308aa5bbcdeea8ed63df412da9'),
+    (b'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789', '043f8582f241db351ce627e153e7f0e4'),
+    (b'1234567890' * 8, 'e33b4ddc9c38f2199c3e7b164fcc0536'),
+]
+
+
+@pytest.mark.parametrize('data, expected', MD4_VECTORS)
+def test_md4_matches_rfc_vectors(pg, data, expected):
+    assert pg._md4(data).hex() == expected
+
+
+def test_ntlm_digest(pg):
+    ntlm = pg.HashAuditor.digest_function('ntlm')
+    assert ntlm('password'.encode('utf-16-le')).hex() == '8846f7eaee8fb117ad06bdd830b7586c'
+
+
+def test_unknown_algorithm_is_rejected(pg):
+    with pytest.raises(ValueError):
+        pg.HashAuditor.digest_function('crc32')
+
+
+def test_index_lookup_and_audit(pg, tmp_path):
+    targets = ['admin123', 'letmein', 'not-a-candidate']
+    dump = tmp_path / 'dump.txt'
+    dump.write_text('\n'.join(f"user{i}:{hashlib.sha1(word.encode()).hexdigest()}"
+                              for i, word in enumerate(targets)) + '\nnot a hash line\n')
+    index = pg.HashIndex.load(str(dump), 'sha1')
+    assert len(index) == 3
+    assert hashlib.sha1(b'letmein').digest() in index
+    assert hashlib.sha1(b'letmein!').digest() not in index
+
+    auditor = pg.HashAuditor(index, batch_size=2)
+    found = dict(auditor.audit(['x', 'letmein', 'admin123', 'letmein', 'y']))
+    assert sorted(found.values()) == ['admin123', 'letmein']
+    assert auditor.hashed == 5
+
+
+def test_salted_audit(pg, tmp_path):
+    dump = tmp_path / 'dump.txt'
+    dump.write_text(hashlib.md5(b'NaClsecret').hexdigest() + '\n')
+    index = pg.HashIndex.load(str(dump), 'md5')
+    auditor = pg.HashAuditor(index, salt='NaCl', salt_format='{salt}{password}')
+    assert [password for _, password in auditor.audit(['secret', 'other'])] == ['secret']
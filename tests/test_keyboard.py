@@ -0,0 +1,6 @@
+def test_keyboard_walks_are_adjacent_key_paths(pg):
+    walker = pg.KeyboardWalker('qwerty')
+    walks = list(walker.iter_walks(3, 4, max_turns=0, shifted=False))
+    assert 'qwe' in walks and 'asdf' in walks and 'zxcv' in walks
+    assert len(walks) == len(set(walks))
+    assert all(3 <= len(walk) <= 4 for walk in walks)
@@ -0,0 +1,4 @@
+def test_leet_variants_fewest_substitutions_first(pg):
+    variants = list(pg.LeetEngine().iter_variants('ace', limit=None))
+    assert variants[0] == 'ace'
+    assert len(variants) == len(set(variants))
@@ -0,0 +1,57 @@
+import itertools
+import math
+import random
+
+import pytest
+
+
+def score(model, word):
+    symbols = len(model.alphabet) + 1
+    previous, total = len(model.alphabet), 0.0
+    for position, following in enumerate([model.alphabet.index(c) for c in word] + [len(model.alphabet)]):
+        total += model.table[(position * symbols + previous) * symbols + following]
+        previous = following
+    return total
+
+
+@pytest.fixture
+def corpus():
+    rng = random.Random(3)
+    return [''.join(rng.choice('abc12!') for _ in range(rng.randint(1, 6))) for _ in range(500)]
+
+
+def test_candidates_follow_training_transitions(pg):
+    model = pg.MarkovModel.train(['abc', 'abc', 'abc', 'abd'])
+    assert list(model.iter_candidates()) == ['abc', 'abd']
+
+
+def test_candidates_come_out_in_descending_probability(pg, corpus):
+    model = pg.MarkovModel.train(corpus)
+    candidates = list(itertools.islice(model.iter_candidates(), 2000))
+    assert len(set(candidates)) == len(candidates)
+    scores = [score(model, word) for word in candidates]
+    assert all(a >= b - 1e-9 for a, b in zip(scores, scores[1:]))
+    assert all(math.isfinite(s) for s in scores)
+
+
+def test_length_window_is_respected(pg, corpus):
+    model = pg.MarkovModel.train(corpus)
+    candidates = list(itertools.islice(model.iter_candidates(min_length=3, max_length=4), 500))
+    assert candidates and all(3 <= len(word) <= 4 for word in candidates)
+
+
+def test_saved_model_loads_memory_mapped(pg, corpus, tmp_path):
+    model = pg.MarkovModel.train(corpus, max_length=8)
+    path = str(tmp_path / 'corpus.pwmk')
+    model.save(path)
+    loaded = pg.MarkovModel.load(path)
+    assert (loaded.alphabet, loaded.max_length) == (model.alphabet, 8)
+    assert list(itertools.islice(loaded.iter_candidates(), 500)) == \
+        list(itertools.islice(model.iter_candidates(), 500))
+
+
+def test_load_rejects_other_files(pg, tmp_path):
+    path = tmp_path / 'not-a-model.pwmk'
+    path.write_bytes(b'\0' * 64)
+    with pytest.raises(ValueError):
+        pg.MarkovModel.load(str(path))
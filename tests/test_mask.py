@@ -0,0 +1,47 @@
+import itertools
+
+import pytest
+
+
+def brute_force(*charsets):
+    return [''.join(chars) for chars in itertools.product(*charsets)]
+
+
+def test_mask_matches_brute_force(pg):
+    mask = pg.MaskGenerator('?d?1x?l', {'1': 'ab?d'})
+    expected = brute_force('0123456789', 'ab0123456789', 'x', 'abcdefghijklmnopqrstuvwxyz')
+    assert mask.keyspace == len(expected)
+    assert list(mask.iter_candidates()) == expected
+    assert [mask.candidate_at(i) for i in (0, 17, len(expected) - 1)] == \
+        [expected[0], expected[17], expected[-1]]
+
+
+def test_mask_skip_and_limit_address_keyspace(pg, monkeypatch):
+    # A tiny suffix table forces several prefix blocks
+    monkeypatch.setattr(pg.MaskGenerator, 'SUFFIX_TABLE_LIMIT', 10)
+    mask = pg.MaskGenerator('?d?d?d')
+    expected = brute_force(*['0123456789'] * 3)
+    for skip, limit in [(0, None), (5, 37), (99, 1), (990, 100), (1000, 5), (3, 0)]:
+        end = None if limit is None else skip + limit
+        assert list(mask.iter_candidates(skip, limit)) == expected[skip:end]
+
+
+def test_mask_policy_matches_filtered_brute_force(pg):
+    mask = pg.MaskGenerator('?u?l?d?s')
+    expected = brute_force(pg.MaskGenerator.CHARSETS['u'], pg.MaskGenerator.CHARSETS['l'],
+                           pg.MaskGenerator.CHARSETS['d'], pg.MaskGenerator.CHARSETS['s'])
+    policy = pg.PasswordPolicy(deny='[aeiou]')
+    assert list(mask.iter_candidates(1000, 50000, policy)) == \
+        [word for word in expected[1000:51000] if policy.check(word)]
+
+
+@pytest.mark.parametrize('mask, charsets', [('?x', {}), ('abc?', {}), ('?1', {'1': '?3a'})])
+def test_mask_rejects_bad_tokens(pg, mask, charsets):
+    with pytest.raises(ValueError):
+        pg.MaskGenerator(mask, charsets)
+
+
+@pytest.mark.parametrize('skip, limit', [(-1, None), (0, -5)])
+def test_mask_rejects_negative_ranges(pg, skip, limit):
+    with pytest.raises(ValueError):
+        pg.MaskGenerator('?d').iter_candidates(skip, limit)
@@ -0,0 +1,31 @@
+import itertools
+
+
+def test_policy_check(pg):
+    policy = pg.PasswordPolicy(8, 12, ['upper', 'digit'], deny='(?i)password')
+    assert policy.check('Secure123')
+    assert not policy.check('secure123')
+    assert not policy.check('Password123')
+    assert not policy.check('S3')
+
+
+def test_level_share_counts_passing_candidates(pg, quiet_generator):
+    policy = pg.PasswordPolicy(8, None, ['digit', 'special'])
+    passwords = quiet_generator(seed=1).generate_comprehensive_list(['admin'], None, 1000)
+    filtered = list(quiet_generator(seed=1).iter_comprehensive_list(['admin'], None, 1000, policy=policy))
+    assert all(policy.check(password) for password in filtered)
+    # Filtering after the raw share would leave only the passing part of the unfiltered list
+    assert len(filtered) > sum(map(policy.check, passwords))
+
+
+def test_policy_run_resumes_to_the_same_output(pg, quiet_generator):
+    policy = pg.PasswordPolicy(8, None, ['digit'])
+    expected = list(quiet_generator(seed=2).iter_comprehensive_list(['corp'], ['bob'], 3000, policy=policy))
+    state = pg.GenerationState()
+    dedup = pg.Deduplicator.create('exact')
+    first = list(itertools.islice(quiet_generator(seed=2).iter_comprehensive_list(
+        ['corp'], ['bob'], 3000, dedup, state, policy), 1700))
+    state = pg.GenerationState.from_dict(state.to_dict())
+    state.emitted = len(first)
+    rest = list(quiet_generator(seed=2).iter_comprehensive_list(['corp'], ['bob'], 3000, dedup, state, policy))
+    assert first + rest == expected
@@ -0,0 +1,6 @@
+def test_random_stream_is_reproducible_and_worker_independent(pg):
+    single = list(pg.RandomStream.generate(5, 3000, workers=1, chunk_size=1000))
+    pooled = list(pg.RandomStream.generate(5, 3000, workers=2, chunk_size=1000))
+    assert single == pooled
+    assert single != list(pg.RandomStream.generate(6, 3000, chunk_size=1000))
+    assert all(8 <= len(word) <= 12 for word in single)
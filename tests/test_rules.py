@@ -0,0 +1,48 @@
+import pytest
+
+
+def apply(pg, rule, words):
+    engine = pg.RuleEngine()
+    engine.add_rule(rule)
+    return [word for batch in engine.apply(words) for word in batch]
+
+
+@pytest.mark.parametrize('rule, expected', [
+    (':', 'p@ssWord'),
+    ('l', 'p@ssword'),
+    ('u', 'P@SSWORD'),
+    ('c', 'P@ssword'),
+    ('t', 'P@SSwORD'),
+    ('r', 'droWss@p'),
+    ('$1 $2', 'p@ssWord12'),
+    ('^X', 'Xp@ssWord'),
+    ('s@a so0', 'passW0rd'),
+    ('[ ]', '@ssWor'),
+    ("'4", 'p@ss'),
+    ('D0', '@ssWord'),
+    ('i2-', 'p@-ssWord'),
+    ('o0P', 'P@ssWord'),
+    ('Z2', 'p@ssWorddd'),
+])
+def test_rule_operations(pg, rule, expected):
+    assert apply(pg, rule, ['p@ssWord']) == [expected]
+
+
+def test_length_rejects_follow_hashcat(pg):
+    words = ['abcd', 'abcde', 'abcdef']
+    # <N rejects words longer than N, >N rejects words shorter than N
+    assert apply(pg, '<5', words) == ['abcd', 'abcde']
+    assert apply(pg, '>5', words) == ['abcde', 'abcdef']
+
+
+def test_character_rejects(pg):
+    assert apply(pg, '!a', ['abc', 'xyz']) == ['xyz']
+    assert apply(pg, '/a', ['abc', 'xyz']) == ['abc']
+
+
+def test_invalid_rule_is_skipped(pg, capsys):
+    engine = pg.RuleEngine()
+    engine.add_rule('$')
+    engine.add_rule('u')
+    assert engine.rejected_rules == 1
+    assert [word for batch in engine.apply(['abc']) for word in batch] == ['ABC']
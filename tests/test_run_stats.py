@@ -0,0 +1,49 @@
+import io
+import time
+
+import pytest
+
+
+def test_counted_flushes_partial_batch(pg):
+    stats = pg.RunStats(batch_size=4)
+    assert list(stats.counted('generated', map(str, range(10)))) == list(map(str, range(10)))
+    assert stats.counters['generated'] == 10
+
+
+def test_counted_settles_when_consumer_stops_early(pg):
+    stats = pg.RunStats(batch_size=4)
+    stream = stats.counted('written', map(str, range(10)))
+    assert [next(stream) for _ in range(6)] == list(map(str, range(6)))
+    stream.close()
+    assert stats.counters['written'] == 6
+
+
+def test_batch_size_must_be_power_of_two(pg):
+    with pytest.raises(ValueError):
+        pg.RunStats(batch_size=1000)
+
+
+def test_generated_is_counted_at_the_source(pg, quiet_generator):
+    policy = pg.PasswordPolicy(min_length=10)
+    dedup = pg.Deduplicator.create('exact')
+    stats = pg.RunStats(dedup=dedup, policy=policy)
+    written = list(stats.counted('written', quiet_generator().iter_comprehensive_list(
+        ['admin'], ['alice'], 500, dedup, policy=policy, stats=stats)))
+
+    counts = stats.snapshot()
+    assert counts['written'] == len(written)
+    assert counts['filtered'] == sum(policy.pruned.values())
+    assert counts['generated'] >= counts['filtered'] + counts['deduped'] + counts['written']
+
+
+def test_phase_excludes_time_timed_inside_it(pg):
+    def slow_source():
+        time.sleep(0.2)
+        yield 'password'
+
+    stats = pg.RunStats(output=io.StringIO())
+    with stats.phase('write'):
+        assert list(stats.timed('generate', slow_source())) == ['password']
+    assert stats.timings['generate'] >= 0.2
+    assert 0 <= stats.timings['write'] < 0.1
+    assert 'generate' in stats.report()
@@ -0,0 +1,74 @@
+import itertools
+import os
+
+
+def test_stored_segment_round_trips(pg, tmp_path):
+    cache = pg.SegmentCache(str(tmp_path))
+    key = cache.key(level='intermediate', keywords=['admin'])
+    words = ['admin', 'Admin123', 'pässwort', 'admin!']
+    assert cache.get(key, 4) is None
+    assert list(cache.store(key, iter(words), 4)) == words
+    assert list(cache.get(key, 4)) == words
+    assert list(cache.get(key, 2)) == words[:2]
+
+
+def test_store_never_pulls_past_count(pg, tmp_path):
+    cache = pg.SegmentCache(str(tmp_path))
+    source = iter(map(str, range(100)))
+    key = cache.key(level='advanced', seed=1)
+    assert list(cache.store(key, source, 10)) == list(map(str, range(10)))
+    assert next(source) == '10'
+    # A segment cut at count may have more words behind it, so a longer request misses
+    assert cache.get(key, 11) is None
+
+
+def test_exhausted_segment_serves_any_count(pg, tmp_path):
+    cache = pg.SegmentCache(str(tmp_path))
+    key = cache.key(level='beginner')
+    list(cache.store(key, iter(['a', 'b', 'c']), 10))
+    assert list(cache.get(key, 1000)) == ['a', 'b', 'c']
+
+
+def test_abandoned_store_leaves_no_segment(pg, tmp_path):
+    cache = pg.SegmentCache(str(tmp_path))
+    key = cache.key(level='beginner')
+    stream = cache.store(key, iter(map(str, range(100))), 50)
+    list(itertools.islice(stream, 5))
+    stream.close()
+    assert cache.get(key, 5) is None
+    assert os.listdir(tmp_path) == []
+
+
+def test_eviction_drops_least_recently_used(pg, tmp_path):
+    cache = pg.SegmentCache(str(tmp_path), max_bytes=1 << 20)
+    old, new = cache.key(n=1), cache.key(n=2)
+    for key in (old, new):
+        list(cache.store(key, (f"{i:08}" for i in range(20000)), 20000))
+    os.utime(tmp_path / f"{old}.seg", (0, 0))
+    cache.max_bytes = os.path.getsize(tmp_path / f"{new}.seg")
+    cache.evict()
+    assert cache.get(old, 1) is None
+    assert cache.get(new, 1) is not None
+
+
+def test_generator_serves_repeat_runs_from_cache(pg, quiet_generator, tmp_path):
+    first = quiet_generator(seed=7)
+    first.cache = pg.SegmentCache(str(tmp_path))
+    expected = list(first.iter_level_cached('advanced', ['admin'], None, 300))
+
+    messages = []
+    second = pg.PasswordListGenerator(seed=7, progress=messages.append)
+    second.cache = pg.SegmentCache(str(tmp_path))
+    assert list(second.iter_level_cached('advanced', ['admin'], None, 300)) == expected
+    assert any('cached' in message for message in messages)
+
+
+def test_comprehensive_list_fills_the_cache(pg, quiet_generator, tmp_path):
+    generator = quiet_generator(seed=7)
+    generator.cache = pg.SegmentCache(str(tmp_path))
+    expected = list(generator.iter_comprehensive_list(['admin'], ['alice'], 2000))
+    assert len(os.listdir(tmp_path)) == 4
+
+    cached = quiet_generator(seed=7)
+    cached.cache = pg.SegmentCache(str(tmp_path))
+    assert list(cached.iter_comprehensive_list(['admin'], ['alice'], 2000)) == expected
@@ -0,0 +1,79 @@
+import http.client
+import http.server
+import json
+import queue
+import threading
+
+import pytest
+
+
+@pytest.fixture
+def worker(pg):
+    pg._service_worker_init()
+    return pg
+
+
+def run_job(pg, job):
+    channel, cancelled = queue.Queue(), threading.Event()
+    pg._service_job(job, channel, cancelled)
+    messages = []
+    while not channel.empty():
+        messages.append(channel.get())
+    return messages
+
+
+def test_count_must_be_within_limit(pg):
+    service = pg.GenerationService(max_count=100)
+    assert service.parse_count({'count': ['100']}) == 100
+    for value in ('0', '101', '-5', 'many'):
+        with pytest.raises(ValueError):
+            service.parse_count({'count': [value]})
+    with pytest.raises(ValueError):
+        service.parse_pattern({'words': ['a'], 'patterns': ['{word}1'], 'count': ['1000']})
+
+
+def test_seeded_job_is_reproducible_and_leaves_worker_rng_alone(pg, worker):
+    job = {'kind': 'generate', 'level': 'advanced', 'keywords': ['corp'], 'names': [], 'count': 100,
+           'seed': 11, 'policy': None}
+    state = pg._service_generator.rng.getstate()
+    first, second = run_job(pg, job), run_job(pg, job)
+    assert first == second
+    assert first[-1] == ('done', 100)
+    assert pg._service_generator.rng.getstate() == state
+
+
+def test_job_errors_are_reported(pg, worker):
+    job = {'kind': 'generate', 'level': 'bogus', 'keywords': [], 'names': [], 'count': 5, 'policy': None}
+    assert run_job(pg, job) == [('error', 'ValueError: Unknown level: bogus')]
+
+
+@pytest.fixture
+def server(pg):
+    service = pg.GenerationService(max_body=16)
+    httpd = http.server.ThreadingHTTPServer(('127.0.0.1', 0), service._handler_class())
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def post_analyze(server, body, headers=None):
+    connection = http.client.HTTPConnection(*server.server_address, timeout=5)
+    try:
+        connection.request('POST', '/analyze', body, headers or {})
+        response = connection.getresponse()
+        return response.status, json.loads(response.read())
+    finally:
+        connection.close()
+
+
+def test_oversized_analyze_body_is_rejected(server):
+    status, body = post_analyze(server, b'password\n' * 10)
+    assert status == 413
+    assert '16 bytes' in body['error']
+
+
+def test_malformed_content_length_is_rejected(server):
+    status, _ = post_analyze(server, b'', {'Content-Length': 'lots'})
+    assert status == 400
@@ -0,0 +1,51 @@
+import os
+
+import pytest
+
+KEYWORDS = ['admin', 'corp', 'sales', 'hr', 'finance']
+NAMES = ['alice', 'bob', 'carol']
+
+
+def test_tasks_split_inputs_and_quotas(pg):
+    sharded = pg.ShardedGenerator(3, seed=1)
+    tasks = sharded.build_tasks('all', KEYWORDS, NAMES, 1000)
+
+    assert sorted(word for task in tasks for word in task['keywords']) == sorted(KEYWORDS)
+    assert sorted(name for task in tasks for name in task['names']) == sorted(NAMES)
+    for level, share in pg.PasswordListGenerator.LEVEL_SHARES:
+        quotas = [quota for task in tasks for stage, quota in task['stages'] if stage == level]
+        assert sum(quotas) == int(1000 * share)
+    # Beginner candidates do not depend on the input, so a single shard owns them
+    assert [task['index'] for task in tasks if task['stages'][0][0] == 'beginner'] == [0]
+    assert len({task['seed'] for task in tasks}) == len(tasks)
+
+
+def test_shard_seeds_depend_on_seed_and_worker_count(pg):
+    assert pg.ShardedGenerator(2, seed=1).shard_seed(0) == pg.ShardedGenerator(2, seed=1).shard_seed(0)
+    assert pg.ShardedGenerator(2, seed=1).shard_seed(0) != pg.ShardedGenerator(2, seed=2).shard_seed(0)
+    assert pg.ShardedGenerator(2, seed=1).shard_seed(0) != pg.ShardedGenerator(3, seed=1).shard_seed(0)
+
+
+@pytest.fixture
+def run(pg, tmp_path):
+    def run(seed=1, workers=2, **options):
+        sharded = pg.ShardedGenerator(workers, seed=seed, temp_dir=str(tmp_path), **options)
+        return list(sharded.iter_candidates('all', KEYWORDS, NAMES, 2000))
+    return run
+
+
+def test_sharded_runs_are_reproducible_and_unique(run, tmp_path):
+    first = run()
+    assert first == run()
+    assert len(set(first)) == len(first) <= 2000
+    assert first != run(seed=2)
+    assert os.listdir(tmp_path) == []
+
+
+def test_policy_and_stats_cover_every_shard(pg, run):
+    policy = pg.PasswordPolicy(min_length=10)
+    stats = pg.RunStats(policy=policy)
+    candidates = run(policy=policy, stats=stats)
+    assert candidates and all(len(word) >= 10 for word in candidates)
+    assert sum(policy.pruned.values()) > 0
+    assert stats.counters['generated'] >= len(candidates) + sum(policy.pruned.values())
@@ -0,0 +1,20 @@
+def test_comprehensive_list_is_seeded_and_unique(quiet_generator):
+    first = quiet_generator(seed=3).generate_comprehensive_list(['corp'], ['alice'], 5000)
+    assert first == quiet_generator(seed=3).generate_comprehensive_list(['corp'], ['alice'], 5000)
+    assert len(first) == len(set(first)) <= 5000
+
+
+def test_lazy_pipeline_matches_list(quiet_generator):
+    expected = quiet_generator(seed=4).generate_comprehensive_list(['corp'], ['alice'], 3000)
+    candidates = quiet_generator(seed=4).iter_comprehensive_list(['corp'], ['alice'], 3000)
+    assert next(candidates) == expected[0]
+    assert [expected[0]] + list(candidates) == expected
+
+
+def test_streamed_save_matches_in_memory_save(pg, quiet_generator, tmp_path, capsys):
+    streamed, listed = tmp_path / 'streamed.txt', tmp_path / 'listed.txt'
+    pg.PasswordUtils.save_wordlist(quiet_generator(seed=4).iter_comprehensive_list(['corp'], None, 3000),
+                                   str(streamed))
+    pg.PasswordUtils.save_wordlist(quiet_generator(seed=4).generate_comprehensive_list(['corp'], None, 3000),
+                                   str(listed))
+    assert streamed.read_bytes() == listed.read_bytes()
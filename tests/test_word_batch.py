@@ -0,0 +1,12 @@
+import pytest
+
+
+def test_word_batch_round_trip(pg):
+    words = [f"pässword{i}" for i in range(1000)]
+    batch = pg.WordBatch.from_words(words, chunk_size=128)
+    assert len(batch) == 1000
+    assert list(batch) == words
+    assert list(batch[100:900]) == words[100:900]
+    assert list(batch[100:900][5:10]) == words[105:110]
+    with pytest.raises(ValueError):
+        batch[::2]
@@ -0,0 +1,40 @@
+import gc
+import itertools
+
+
+def test_word_source_shards_partition_unique_words(pg, tmp_path):
+    source_file = tmp_path / 'words.txt'
+    source_file.write_text('Alpha\nalpha\n  beta  \n\nAlpha\ngamma\n')
+    source = pg.WordSource([str(source_file)], extra=['delta'], lowercase=True)
+    assert list(source) == ['delta', 'alpha', 'beta', 'gamma']
+    assert list(source) == list(source)
+    shards = [source.shard(index, 3) for index in range(3)]
+    assert sorted(itertools.chain.from_iterable(shards)) == sorted(source)
+    assert [len(shard) for shard in shards] == [2, 1, 1]
+    assert not pg.WordSource([], extra=['only']).shard(2, 3)
+
+
+def test_shard_view_outlives_its_source(pg, tmp_path):
+    source_file = tmp_path / 'words.txt'
+    source_file.write_text('one\ntwo\nthree\n')
+    view = pg.WordSource([str(source_file)]).shard(0, 2)
+    gc.collect()
+    assert len(view) == 2
+    assert list(view) == ['one', 'three']
+    words = iter(view)
+    del view
+    gc.collect()
+    assert list(words) == ['one', 'three']
+
+
+def test_spill_file_is_removed_with_the_last_reference(pg, tmp_path):
+    source_file = tmp_path / 'words.txt'
+    source_file.write_text('one\ntwo\n')
+    source = pg.WordSource([str(source_file)], temp_dir=str(tmp_path))
+    view = source.shard(1, 2)
+    del source
+    gc.collect()
+    assert list(view) == ['two']
+    del view
+    gc.collect()
+    assert not list(tmp_path.glob('pwgen-words-*'))
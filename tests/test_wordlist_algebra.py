@@ -0,0 +1,45 @@
+import collections
+import random
+
+import pytest
+
+
+@pytest.fixture
+def wordlists(tmp_path):
+    rng = random.Random(7)
+    paths, lists = [], []
+    for i in range(6):
+        words = [rng.choice('abcdef') + rng.choice('xyz') for _ in range(rng.randint(5, 40))]
+        path = tmp_path / f"list{i}.txt"
+        path.write_text('\n'.join(words) + '\n')
+        paths.append(str(path))
+        lists.append(words)
+    return paths, lists
+
+
+@pytest.mark.parametrize('fan_in, chunk_size', [(128, 1000), (2, 3)])
+def test_set_operations_match_python_sets(pg, wordlists, monkeypatch, fan_in, chunk_size):
+    monkeypatch.setattr(pg.WordlistAlgebra, 'MERGE_FAN_IN', fan_in)
+    paths, lists = wordlists
+    sets = [set(words) for words in lists]
+
+    def result(operation, top=1000):
+        algebra = pg.WordlistAlgebra(chunk_size)
+        return list(algebra.iter_result(operation, paths, top))
+
+    assert result('union') == sorted(set().union(*sets))
+    assert result('intersect') == sorted(set.intersection(*sets))
+    assert result('subtract') == sorted(sets[0].difference(*sets[1:]))
+    counts = collections.Counter(word for words in lists for word in words)
+    assert result('top', 5) == [word for word, _ in sorted(counts.items(), key=lambda item: (-item[1], item[0]))[:5]]
+
+
+def test_intersect_needs_two_inputs(pg, wordlists):
+    with pytest.raises(ValueError):
+        list(pg.WordlistAlgebra().iter_result('intersect', wordlists[0][:1]))
+
+
+def test_runs_are_cleaned_up(pg, wordlists, tmp_path):
+    algebra = pg.WordlistAlgebra(chunk_size=2, temp_dir=str(tmp_path))
+    list(algebra.iter_result('union', wordlists[0]))
+    assert not list(tmp_path.glob('pwgen-set-*'))
@@ -0,0 +1,66 @@
+import json
+
+import pytest
+
+WORDS = [f"word{i}" for i in range(1000)] + ['pässwort', 'quote"d']
+
+
+def failing_words():
+    yield from WORDS[:10]
+    raise RuntimeError('generator failed')
+
+
+@pytest.mark.parametrize('filename', ['out.txt', 'out.txt.gz', 'out.txt.bz2', 'out.txt.xz', 'out.txt.zst'])
+@pytest.mark.parametrize('background', [False, True])
+def test_txt_round_trips_through_compression(pg, tmp_path, filename, background):
+    path = str(tmp_path / filename)
+    with pg.WordlistWriter(path, batch_size=64, background=background) as writer:
+        writer.write_many(WORDS)
+    assert writer.count == len(WORDS)
+    assert list(pg.PasswordUtils.iter_wordlist(path)) == WORDS
+
+
+@pytest.mark.parametrize('format_type', ['json', 'jsonl'])
+def test_json_formats_round_trip(pg, tmp_path, format_type):
+    path = str(tmp_path / f"out.{format_type}")
+    with pg.WordlistWriter(path, format_type, batch_size=64) as writer:
+        for word in WORDS:
+            writer.write(word)
+    assert list(pg.PasswordUtils.iter_wordlist(path, format_type)) == WORDS
+    if format_type == 'json':
+        with open(path, encoding='utf-8') as f:
+            assert json.load(f)['metadata']['total_passwords'] == len(WORDS)
+
+
+def test_write_batch_matches_write_many(pg, tmp_path):
+    path = str(tmp_path / 'batch.txt')
+    with pg.WordlistWriter(path) as writer:
+        writer.write_batch(pg.WordBatch.from_words(WORDS))
+    assert list(pg.PasswordUtils.iter_wordlist(path)) == WORDS
+
+
+def test_atomic_output_appears_only_on_success(pg, tmp_path):
+    path = tmp_path / 'atomic.txt'
+    with pytest.raises(RuntimeError, match='generator failed'):
+        with pg.WordlistWriter(str(path), atomic=True) as writer:
+            writer.write_many(failing_words())
+    assert list(tmp_path.iterdir()) == []
+
+    with pg.WordlistWriter(str(path), atomic=True) as writer:
+        writer.write_many(WORDS)
+    assert [p.name for p in tmp_path.iterdir()] == ['atomic.txt']
+
+
+def test_exception_is_not_masked_by_a_failing_close(pg, tmp_path):
+    with pytest.raises(RuntimeError, match='generator failed'):
+        with pg.WordlistWriter(str(tmp_path / 'out.json'), 'json', background=True) as writer:
+            # Finishing json output would raise from the closed stream
+            writer._stream.close()
+            writer.write_many(failing_words())
+
+
+def test_unknown_format_and_bad_append_are_rejected(pg, tmp_path):
+    with pytest.raises(ValueError):
+        pg.WordlistWriter(str(tmp_path / 'out.csv'), 'csv')
+    with pytest.raises(ValueError):
+        pg.WordlistWriter(str(tmp_path / 'out.json'), 'json', append=True)